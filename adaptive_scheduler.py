@@ -0,0 +1,170 @@
+import argparse
+import time
+import cv2
+from face_detectors import HaarDetector
+
+# SETTINGS
+MIN_INTERVAL = 0.1      # seconds between detections right after a change
+MAX_INTERVAL = 2.0      # seconds between detections once the state is stable
+BACKOFF = 1.5           # interval growth per unchanged detection
+CPU_BUDGET = 0.25       # max share of one core spent on detection
+LOW_CONFIDENCE = 0.5    # detections below this are treated like a transition
+CHECK_INTERVAL = 5      # seconds between checks in read2.py/read3.py/read4.py
+
+
+# ----------------------- Scheduler -----------------------
+
+class AdaptiveScheduler:
+    def __init__(self, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, backoff=BACKOFF,
+                 cpu_budget=CPU_BUDGET, low_confidence=LOW_CONFIDENCE):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.low_confidence = low_confidence
+        self.interval = min_interval
+        self.last_run = None
+        self.last_state = None
+        self.avg_cost = 0.0
+        self.stats = {"frames": 0, "detections": 0, "cpu_time": 0.0}
+
+    # Called once per frame; True means run the detector on this frame.
+    def due(self, now):
+        self.stats["frames"] += 1
+        return self.last_run is None or now - self.last_run >= self.interval
+
+    # Called after every detection with its result state and CPU cost. `inferred`
+    # is False when a ChangeFilter handed back its previous result; that near-zero
+    # cost is not what a real detection costs, so it stays out of avg_cost.
+    def record(self, now, state, cost, confidence=None, inferred=True):
+        self.last_run = now
+        self.stats["detections"] += 1
+        self.stats["cpu_time"] += cost
+        if inferred:
+            self.avg_cost = cost if not self.avg_cost else 0.8 * self.avg_cost + 0.2 * cost
+
+        unsure = confidence is not None and confidence < self.low_confidence
+        if state != self.last_state or unsure:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        self.last_state = state
+        # Never detect more often than the CPU budget allows.
+        if self.cpu_budget:
+            self.interval = max(self.interval, self.avg_cost / self.cpu_budget)
+
+    def report(self):
+        frames, detections = self.stats["frames"], self.stats["detections"]
+        every_frame_cpu = self.avg_cost * frames
+        cpu_saved = max(every_frame_cpu - self.stats["cpu_time"], 0.0)
+        return {
+            "frames": frames,
+            "detections": detections,
+            "skipped": frames - detections,
+            "skipped_pct": (1 - detections / frames) * 100 if frames else 0.0,
+            "cpu_time": self.stats["cpu_time"],
+            "cpu_saved": cpu_saved,
+            "cpu_saved_pct": cpu_saved / every_frame_cpu * 100 if every_frame_cpu else 0.0,
+        }
+
+
+def face_state(faces):
+    return min(len(faces), 2)     # 0 = no face, 1 = one face, 2 = multiple faces
+
+
+# --- Helper: run detection on this frame if the scheduler (or a forced check) asks for it ---
+# With a change_filter the detector only runs on changed frames; reused results
+# are recorded as not inferred. The weakest face score is passed as confidence.
+def timed_detect(scheduler, now, detect, frame, force=False, change_filter=None):
+    if not (scheduler.due(now) or force):
+        return None
+    t0 = time.process_time()
+    if change_filter:
+        inferences = change_filter.stats["inferences"]
+        faces = change_filter.run(frame, now, detect)
+        inferred = change_filter.stats["inferences"] > inferences
+    else:
+        faces = detect(frame)
+        inferred = True
+    scores = [face.score for face in faces if hasattr(face, "score")]
+    scheduler.record(now, face_state(faces), time.process_time() - t0,
+                     confidence=min(scores) if scores else None, inferred=inferred)
+    return faces
+
+
+# ----------------------- Benchmark -----------------------
+
+# Violation events = runs of frames whose every-frame state is not "one face".
+def _events(states):
+    events, start = [], None
+    for i, s in enumerate(states + [1]):
+        if s != 1 and start is None:
+            start = i
+        elif s == 1 and start is not None:
+            events.append((start, i - 1))
+            start = None
+    return events
+
+
+def benchmark_clip(path, scheduler_kwargs=None):
+    detect = HaarDetector(1.3, 5)
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    scheduler = AdaptiveScheduler(**(scheduler_kwargs or {}))
+    baseline, adaptive = [], []
+    baseline_cpu = 0.0
+    held = 1
+    index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        now = index / fps
+        t0 = time.process_time()
+        faces = detect(frame)
+        baseline_cpu += time.process_time() - t0
+        baseline.append(face_state(faces))
+        scores = [face.score for face in faces]
+
+        # Reuse the baseline result so both paths see identical detections;
+        # only the schedule differs. The cost charged is the measured one.
+        if scheduler.due(now):
+            scheduler.record(now, baseline[-1], time.process_time() - t0, min(scores) if scores else None)
+            held = baseline[-1]
+        adaptive.append(held)
+        index += 1
+    cap.release()
+
+    events = _events(baseline)
+    caught = sum(any(adaptive[i] != 1 for i in range(s, e + 1)) for s, e in events)
+    report = scheduler.report()
+    return {
+        "clip": path,
+        "frames": index,
+        "events": len(events),
+        "recall": caught / len(events) if events else 1.0,
+        "frame_agreement": sum(a == b for a, b in zip(baseline, adaptive)) / max(index, 1),
+        "baseline_cpu": baseline_cpu,
+        "adaptive_cpu": report["cpu_time"],
+        "cpu_saved_pct": (1 - report["cpu_time"] / baseline_cpu) * 100 if baseline_cpu else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare adaptive detection scheduling with every-frame Haar.")
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--min-interval", type=float, default=MIN_INTERVAL)
+    parser.add_argument("--max-interval", type=float, default=MAX_INTERVAL)
+    parser.add_argument("--cpu-budget", type=float, default=CPU_BUDGET)
+    args = parser.parse_args()
+
+    kwargs = {"min_interval": args.min_interval, "max_interval": args.max_interval, "cpu_budget": args.cpu_budget}
+    print(f"{'Clip':30s} {'Frames':>7s} {'Events':>7s} {'Recall':>7s} {'Agree':>7s} {'CPU saved':>10s}")
+    for path in args.clips:
+        r = benchmark_clip(path, kwargs)
+        print(f"{path[-30:]:30s} {r['frames']:7d} {r['events']:7d} {r['recall'] * 100:6.1f}% "
+              f"{r['frame_agreement'] * 100:6.1f}% {r['cpu_saved_pct']:9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
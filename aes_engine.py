@@ -0,0 +1,298 @@
+import os
+import time
+import struct
+from Crypto.Cipher import AES
+from main import bytes_to_matrix, print_state
+
+# ----------------------- Field Arithmetic & S-box -----------------------
+
+def xtime(a):
+    a <<= 1
+    return (a ^ 0x11B) if a & 0x100 else a
+
+
+def gmul(a, b):
+    out = 0
+    while b:
+        if b & 1:
+            out ^= a
+        a, b = xtime(a), b >> 1
+    return out
+
+
+def build_sbox():
+    sbox, inv = [0] * 256, [0] * 256
+    for x in range(256):
+        y = next((c for c in range(1, 256) if gmul(x, c) == 1), 0)
+        s = y
+        for shift in range(1, 5):
+            s ^= ((y << shift) | (y >> (8 - shift))) & 0xFF
+        s ^= 0x63
+        sbox[x], inv[s] = s, x
+    return sbox, inv
+
+
+SBOX, INV_SBOX = build_sbox()
+RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+
+
+# ----------------------- T-tables -----------------------
+
+def ror8(w):
+    return ((w >> 8) | (w << 24)) & 0xFFFFFFFF
+
+
+def build_t_tables():
+    te0, td0 = [], []
+    for x in range(256):
+        s, i = SBOX[x], INV_SBOX[x]
+        te0.append(gmul(s, 2) << 24 | s << 16 | s << 8 | gmul(s, 3))
+        td0.append(gmul(i, 14) << 24 | gmul(i, 9) << 16 | gmul(i, 13) << 8 | gmul(i, 11))
+    te1 = [ror8(w) for w in te0]
+    te2 = [ror8(w) for w in te1]
+    te3 = [ror8(w) for w in te2]
+    td1 = [ror8(w) for w in td0]
+    td2 = [ror8(w) for w in td1]
+    td3 = [ror8(w) for w in td2]
+    return (te0, te1, te2, te3), (td0, td1, td2, td3)
+
+
+TE, TD = build_t_tables()
+
+
+# ----------------------- Key Expansion -----------------------
+
+def expand_key(key):
+    nk = len(key) // 4
+    if len(key) not in (16, 24, 32):
+        raise ValueError("AES key must be 16, 24 or 32 bytes.")
+    nr = nk + 6
+    w = list(struct.unpack(f">{nk}I", key))
+    for i in range(nk, 4 * (nr + 1)):
+        t = w[i - 1]
+        if i % nk == 0:
+            t = (t << 8 | t >> 24) & 0xFFFFFFFF
+            t = (SBOX[t >> 24] << 24 | SBOX[t >> 16 & 255] << 16 |
+                 SBOX[t >> 8 & 255] << 8 | SBOX[t & 255])
+            t ^= RCON[i // nk - 1] << 24
+        elif nk > 6 and i % nk == 4:
+            t = (SBOX[t >> 24] << 24 | SBOX[t >> 16 & 255] << 16 |
+                 SBOX[t >> 8 & 255] << 8 | SBOX[t & 255])
+        w.append(w[i - nk] ^ t)
+    return w
+
+
+# Round keys for the equivalent inverse cipher: reversed, with InvMixColumns
+# applied to the middle rounds so decryption can use the Td tables directly.
+def expand_decrypt_key(w):
+    nr = len(w) // 4 - 1
+    td0, td1, td2, td3 = TD
+    dk = []
+    for r in range(nr, -1, -1):
+        for word in w[4 * r:4 * r + 4]:
+            if 0 < r < nr:
+                word = (td0[SBOX[word >> 24]] ^ td1[SBOX[word >> 16 & 255]] ^
+                        td2[SBOX[word >> 8 & 255]] ^ td3[SBOX[word & 255]])
+            dk.append(word)
+    return dk
+
+
+# ----------------------- Traced Step-by-Step Mode -----------------------
+
+# State uses the bytes_to_matrix layout: s[c][r] is column c, row r.
+def add_round_key(s, w, rnd):
+    for c in range(4):
+        k = w[4 * rnd + c].to_bytes(4, "big")
+        for r in range(4):
+            s[c][r] ^= k[r]
+
+
+def sub_bytes(s, box=SBOX):
+    for c in range(4):
+        for r in range(4):
+            s[c][r] = box[s[c][r]]
+
+
+def shift_rows(s, sign=1):
+    for r in range(1, 4):
+        row = [s[c][r] for c in range(4)]
+        for c in range(4):
+            s[c][r] = row[(c + sign * r) % 4]
+
+
+def mix_columns(s, coeffs=(2, 3, 1, 1)):
+    for c in range(4):
+        col = s[c][:]
+        for r in range(4):
+            s[c][r] = (gmul(col[r], coeffs[0]) ^ gmul(col[(r + 1) % 4], coeffs[1]) ^
+                       gmul(col[(r + 2) % 4], coeffs[2]) ^ gmul(col[(r + 3) % 4], coeffs[3]))
+
+
+def encrypt_block_steps(block, w, trace=False):
+    nr = len(w) // 4 - 1
+    s = bytes_to_matrix(block)
+    add_round_key(s, w, 0)
+    if trace:
+        print_state("Round 0 - AddRoundKey", s)
+    for rnd in range(1, nr + 1):
+        sub_bytes(s)
+        if trace:
+            print_state(f"Round {rnd} - SubBytes", s)
+        shift_rows(s)
+        if trace:
+            print_state(f"Round {rnd} - ShiftRows", s)
+        if rnd != nr:
+            mix_columns(s)
+            if trace:
+                print_state(f"Round {rnd} - MixColumns", s)
+        add_round_key(s, w, rnd)
+        if trace:
+            print_state(f"Round {rnd} - AddRoundKey", s)
+    return bytes(b for col in s for b in col)
+
+
+def decrypt_block_steps(block, w, trace=False):
+    nr = len(w) // 4 - 1
+    s = bytes_to_matrix(block)
+    add_round_key(s, w, nr)
+    if trace:
+        print_state(f"Round {nr} - AddRoundKey", s)
+    for rnd in range(nr - 1, -1, -1):
+        shift_rows(s, -1)
+        sub_bytes(s, INV_SBOX)
+        add_round_key(s, w, rnd)
+        if rnd:
+            mix_columns(s, (14, 11, 13, 9))
+        if trace:
+            print_state(f"Round {rnd} - Inverse Round", s)
+    return bytes(b for col in s for b in col)
+
+
+# ----------------------- Fast T-table Mode -----------------------
+
+def encrypt_blocks_fast(data, w):
+    te0, te1, te2, te3 = TE
+    nr = len(w) // 4 - 1
+    sb = SBOX
+    out = bytearray(len(data))
+    for off in range(0, len(data), 16):
+        s0, s1, s2, s3 = struct.unpack_from(">4I", data, off)
+        s0 ^= w[0]
+        s1 ^= w[1]
+        s2 ^= w[2]
+        s3 ^= w[3]
+        k = 4
+        for _ in range(nr - 1):
+            s0, s1, s2, s3 = (
+                te0[s0 >> 24] ^ te1[s1 >> 16 & 255] ^ te2[s2 >> 8 & 255] ^ te3[s3 & 255] ^ w[k],
+                te0[s1 >> 24] ^ te1[s2 >> 16 & 255] ^ te2[s3 >> 8 & 255] ^ te3[s0 & 255] ^ w[k + 1],
+                te0[s2 >> 24] ^ te1[s3 >> 16 & 255] ^ te2[s0 >> 8 & 255] ^ te3[s1 & 255] ^ w[k + 2],
+                te0[s3 >> 24] ^ te1[s0 >> 16 & 255] ^ te2[s1 >> 8 & 255] ^ te3[s2 & 255] ^ w[k + 3])
+            k += 4
+        struct.pack_into(
+            ">4I", out, off,
+            (sb[s0 >> 24] << 24 | sb[s1 >> 16 & 255] << 16 | sb[s2 >> 8 & 255] << 8 | sb[s3 & 255]) ^ w[k],
+            (sb[s1 >> 24] << 24 | sb[s2 >> 16 & 255] << 16 | sb[s3 >> 8 & 255] << 8 | sb[s0 & 255]) ^ w[k + 1],
+            (sb[s2 >> 24] << 24 | sb[s3 >> 16 & 255] << 16 | sb[s0 >> 8 & 255] << 8 | sb[s1 & 255]) ^ w[k + 2],
+            (sb[s3 >> 24] << 24 | sb[s0 >> 16 & 255] << 16 | sb[s1 >> 8 & 255] << 8 | sb[s2 & 255]) ^ w[k + 3])
+    return out
+
+
+def decrypt_blocks_fast(data, dk):
+    td0, td1, td2, td3 = TD
+    nr = len(dk) // 4 - 1
+    ib = INV_SBOX
+    out = bytearray(len(data))
+    for off in range(0, len(data), 16):
+        s0, s1, s2, s3 = struct.unpack_from(">4I", data, off)
+        s0 ^= dk[0]
+        s1 ^= dk[1]
+        s2 ^= dk[2]
+        s3 ^= dk[3]
+        k = 4
+        for _ in range(nr - 1):
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[s3 >> 16 & 255] ^ td2[s2 >> 8 & 255] ^ td3[s1 & 255] ^ dk[k],
+                td0[s1 >> 24] ^ td1[s0 >> 16 & 255] ^ td2[s3 >> 8 & 255] ^ td3[s2 & 255] ^ dk[k + 1],
+                td0[s2 >> 24] ^ td1[s1 >> 16 & 255] ^ td2[s0 >> 8 & 255] ^ td3[s3 & 255] ^ dk[k + 2],
+                td0[s3 >> 24] ^ td1[s2 >> 16 & 255] ^ td2[s1 >> 8 & 255] ^ td3[s0 & 255] ^ dk[k + 3])
+            k += 4
+        struct.pack_into(
+            ">4I", out, off,
+            (ib[s0 >> 24] << 24 | ib[s3 >> 16 & 255] << 16 | ib[s2 >> 8 & 255] << 8 | ib[s1 & 255]) ^ dk[k],
+            (ib[s1 >> 24] << 24 | ib[s0 >> 16 & 255] << 16 | ib[s3 >> 8 & 255] << 8 | ib[s2 & 255]) ^ dk[k + 1],
+            (ib[s2 >> 24] << 24 | ib[s1 >> 16 & 255] << 16 | ib[s0 >> 8 & 255] << 8 | ib[s3 & 255]) ^ dk[k + 2],
+            (ib[s3 >> 24] << 24 | ib[s2 >> 16 & 255] << 16 | ib[s1 >> 8 & 255] << 8 | ib[s0 & 255]) ^ dk[k + 3])
+    return out
+
+
+# ----------------------- Public API -----------------------
+
+def aes_encrypt(data, key, trace=False):
+    if len(data) % 16:
+        raise ValueError("Data must be a multiple of 16 bytes.")
+    w = expand_key(key)
+    if not trace:
+        return bytes(encrypt_blocks_fast(data, w))
+    return b"".join(encrypt_block_steps(data[i:i + 16], w, True) for i in range(0, len(data), 16))
+
+
+def aes_decrypt(data, key, trace=False):
+    if len(data) % 16:
+        raise ValueError("Data must be a multiple of 16 bytes.")
+    w = expand_key(key)
+    if not trace:
+        return bytes(decrypt_blocks_fast(data, expand_decrypt_key(w)))
+    return b"".join(decrypt_block_steps(data[i:i + 16], w, True) for i in range(0, len(data), 16))
+
+
+# ----------------------- Validation & Benchmark -----------------------
+
+def verify_against_pycryptodome(trials=50):
+    for key_len in (16, 24, 32):
+        for _ in range(trials):
+            key, data = os.urandom(key_len), os.urandom(64)
+            expected = AES.new(key, AES.MODE_ECB).encrypt(data)
+            w = expand_key(key)
+            step = b"".join(encrypt_block_steps(data[i:i + 16], w) for i in range(0, 64, 16))
+            if aes_encrypt(data, key) != expected or step != expected:
+                raise AssertionError(f"Encrypt mismatch for key={key.hex()}")
+            step = b"".join(decrypt_block_steps(expected[i:i + 16], w) for i in range(0, 64, 16))
+            if aes_decrypt(expected, key) != data or step != data:
+                raise AssertionError(f"Decrypt mismatch for key={key.hex()}")
+    return 3 * trials
+
+
+def benchmark(blocks=4096):
+    data = os.urandom(16 * blocks)
+    for key_len in (16, 24, 32):
+        key = os.urandom(key_len)
+        w = expand_key(key)
+
+        t0 = time.perf_counter()
+        for i in range(0, 16 * 256, 16):
+            encrypt_block_steps(data[i:i + 16], w)
+        step_rate = 256 / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        encrypt_blocks_fast(data, w)
+        fast_rate = blocks / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        AES.new(key, AES.MODE_ECB).encrypt(data)
+        native_rate = blocks / (time.perf_counter() - t0)
+
+        print(f"AES-{key_len * 8}: steps {step_rate:,.0f} blocks/s | "
+              f"T-table {fast_rate:,.0f} blocks/s | PyCryptodome {native_rate:,.0f} blocks/s")
+
+
+def main():
+    print("--- AES-128 All Rounds (traced) ---")
+    enc = aes_encrypt(b"Data encryption!", b"StrongAESKey1234", trace=True)
+    print(f"\nAES Encrypted: {enc.hex()}")
+    print(f"Verified {verify_against_pycryptodome()} keys against PyCryptodome")
+    benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from Crypto.Cipher import AES, DES
+from Crypto.Util.Padding import pad, unpad
+from cipher_cache import default_cache
+from main import (caesar_cipher, monoalphabetic_cipher, vigenere_cipher, playfair_cipher,
+                  rail_fence_cipher, columnar_transposition_cipher)
+
+# SETTINGS
+MIN_SIZE = 64                  # bytes
+MAX_SIZE = 256 * 1024 * 1024   # bytes
+SIZE_STEP = 4                  # each size is this many times the previous one
+TIME_BUDGET = 5.0              # seconds; a cipher stops growing once a run exceeds this
+BASE_BLOCK = 64 * 1024         # random text is generated once and repeated up to the size
+
+MONO_KEY = "QWERTYUIOPASDFGHJKLZXCVBNM"
+
+
+# ----------------------- Inputs -----------------------
+
+def make_text(size, seed=0):
+    rng = random.Random(seed)
+    words, total = [], 0
+    while total < min(size, BASE_BLOCK):
+        word = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 9)))
+        words.append(word.capitalize() if rng.random() < 0.1 else word)
+        total += len(word) + 1
+    base = " ".join(words)
+    return (base * (size // len(base) + 1))[:size]
+
+
+# Playfair drops spaces, folds j into i and pads doubled letters with x, so the
+# round-trip input avoids all three; the base length is even so repeats stay aligned.
+def make_playfair_text(size, seed=0):
+    rng = random.Random(seed)
+    letters = "abcdefghiklmnopqrstuvwyz"
+    base = []
+    for _ in range(min(size, BASE_BLOCK) // 2 or 1):
+        a = rng.choice(letters)
+        base.append(a + rng.choice(letters.replace(a, "")))
+    base = "".join(base)
+    return (base * (size // len(base) + 1))[:size - size % 2]
+
+
+# ----------------------- Cipher Cases -----------------------
+
+def _columnar_expected(text, key="KEY"):
+    return text.ljust(math.ceil(len(text) / len(key)) * len(key), 'x')
+
+
+CASES = {
+    "caesar": (make_text, lambda t: caesar_cipher(t, 5),
+               lambda c: caesar_cipher(c, 5, 'decrypt'), None),
+    "monoalphabetic": (make_text, lambda t: monoalphabetic_cipher(t, MONO_KEY),
+                       lambda c: monoalphabetic_cipher(c, MONO_KEY, 'decrypt'), None),
+    "vigenere": (make_text, lambda t: vigenere_cipher(t, "SECRET"),
+                 lambda c: vigenere_cipher(c, "SECRET", 'decrypt'), None),
+    "playfair": (make_playfair_text, lambda t: playfair_cipher(t, "fortify")[0],
+                 lambda c: playfair_cipher(c, "fortify", 'decrypt')[0], None),
+    "rail_fence": (make_text, lambda t: rail_fence_cipher(t, 3),
+                   lambda c: rail_fence_cipher(c, 3, 'decrypt'), None),
+    "columnar": (make_text, lambda t: columnar_transposition_cipher(t, "KEY"),
+                 lambda c: columnar_transposition_cipher(c, "KEY", 'decrypt'), _columnar_expected),
+    "aes_ecb": (lambda size: make_text(size).encode(),
+                lambda t: default_cache.ecb(b"StrongAESKey1234").encrypt(pad(t, AES.block_size)),
+                lambda c: unpad(default_cache.ecb(b"StrongAESKey1234").decrypt(c), AES.block_size), None),
+    "des_ecb": (lambda size: make_text(size).encode(),
+                lambda t: default_cache.ecb(bytes.fromhex("133457799BBCDFF1"), "DES").encrypt(pad(t, DES.block_size)),
+                lambda c: unpad(default_cache.ecb(bytes.fromhex("133457799BBCDFF1"), "DES").decrypt(c), DES.block_size),
+                None),
+}
+
+
+# ----------------------- Measurement -----------------------
+
+def measure(case, size, budget):
+    make_input, encrypt, decrypt, expected = case
+    data = make_input(size)
+
+    t0 = time.perf_counter()
+    enc = encrypt(data)
+    t1 = time.perf_counter()
+    dec = decrypt(enc)
+    t2 = time.perf_counter()
+    roundtrip = dec == (expected(data) if expected else data)
+
+    # Tracing allocations slows everything down, so peak memory is taken in a
+    # second pass and only when the timed pass left room in the budget.
+    peak = None
+    if (t2 - t0) * 3 < budget:
+        del enc, dec
+        tracemalloc.start()
+        decrypt(encrypt(data))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "size": len(data),
+        "encrypt_s": t1 - t0,
+        "decrypt_s": t2 - t1,
+        "throughput_bps": len(data) / max(t2 - t0, 1e-9),
+        "peak_bytes": peak,
+        "roundtrip": roundtrip,
+    }
+
+
+# Least-squares slope of log(time) against log(size): ~1 is linear, ~2 quadratic.
+# Tiny sizes are dominated by call overhead, so only runs above 1 ms count.
+def complexity_slope(rows):
+    points = [(math.log(r["size"]), math.log(r["encrypt_s"] + r["decrypt_s"]))
+              for r in rows if r["encrypt_s"] + r["decrypt_s"] > 1e-3]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    var = sum((x - mx) ** 2 for x, _ in points)
+    return sum((x - mx) * (y - my) for x, y in points) / var if var else None
+
+
+def run(names, min_size=MIN_SIZE, max_size=MAX_SIZE, budget=TIME_BUDGET):
+    results = {}
+    for name in names:
+        rows, size = [], min_size
+        while size <= max_size:
+            row = measure(CASES[name], size, budget)
+            rows.append(row)
+            print(f"{name:15s} {row['size']:>11,d} B  {row['throughput_bps'] / 1e6:10.2f} MB/s  "
+                  f"peak={row['peak_bytes'] if row['peak_bytes'] is not None else '-':>11}  "
+                  f"roundtrip={'OK' if row['roundtrip'] else 'FAIL'}")
+            if row["encrypt_s"] + row["decrypt_s"] > budget:
+                break
+            size *= SIZE_STEP
+        results[name] = {"runs": rows, "slope": complexity_slope(rows)}
+        slope = results[name]["slope"]
+        print(f"{name:15s} slope={slope:.2f}" if slope is not None else f"{name:15s} slope=n/a")
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ----------------------- Comparison -----------------------
+
+def compare(old, new):
+    print("\n--- Comparison (new vs old) ---")
+    for name, result in new["results"].items():
+        before = old.get("results", {}).get(name)
+        if not before:
+            continue
+        old_runs = {r["size"]: r for r in before["runs"]}
+        for row in result["runs"]:
+            prev = old_runs.get(row["size"])
+            if prev:
+                ratio = row["throughput_bps"] / max(prev["throughput_bps"], 1e-9)
+                print(f"{name:15s} {row['size']:>11,d} B  {ratio:6.2f}x throughput")
+        if before["slope"] is not None and result["slope"] is not None:
+            print(f"{name:15s} slope {before['slope']:.2f} -> {result['slope']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ciphers in main.py across input sizes.")
+    parser.add_argument("--ciphers", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--min-size", type=int, default=MIN_SIZE)
+    parser.add_argument("--max-size", type=int, default=MAX_SIZE)
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET)
+    parser.add_argument("--output", default="cipher_benchmark.json")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "results": run(args.ciphers, args.min_size, args.max_size, args.budget),
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
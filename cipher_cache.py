@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from Crypto.Cipher import DES, AES
+
+# SETTINGS
+CACHE_SIZE = 64           # prepared key contexts kept before LRU eviction
+CHUNK_SIZE = 1 << 20      # bytes handed to the cipher per call when streaming
+
+ALGORITHMS = {"AES": AES, "DES": DES}
+STREAM_MODES = ("CBC", "CTR", "GCM")
+
+
+# ----------------------- Keyed Cipher Cache -----------------------
+
+class CipherCache:
+    # ECB objects carry no per-message state, so one prepared object per key is
+    # reused for every block/message. CBC/CTR/GCM objects hold an IV/counter/tag
+    # and must be fresh per message, and PyCryptodome re-runs the key schedule
+    # for each one, so the cache cannot help there: those calls bypass it and
+    # are counted in `uncached`, never as hits. (Rebuilding CTR on the cached
+    # ECB object was tried and was slower than a fresh C-level CTR object.)
+    def __init__(self, max_size=CACHE_SIZE):
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, algorithm, key):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        entry_key = (algorithm, bytes(key))
+        cipher = self._entries.get(entry_key)
+        if cipher is not None:
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return entry_key[1], cipher
+        self.misses += 1
+        module = ALGORITHMS[algorithm]
+        cipher = module.new(entry_key[1], module.MODE_ECB)
+        self._entries[entry_key] = cipher
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry_key[1], cipher
+
+    def ecb(self, key, algorithm="AES"):
+        return self._lookup(algorithm, key)[1]
+
+    def cipher(self, key, mode="ECB", algorithm="AES", **params):
+        if mode == "ECB":
+            return self.ecb(key, algorithm)
+        if mode not in STREAM_MODES:
+            raise ValueError(f"Unsupported mode: {mode}")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        self.uncached += 1
+        module = ALGORITHMS[algorithm]
+        return module.new(bytes(key), getattr(module, "MODE_" + mode), **params)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    # --- Bulk helpers ---
+    def encrypt_blocks(self, key, data, algorithm="AES", output=None):
+        return _stream(self.ecb(key, algorithm).encrypt, data, output)
+
+    def decrypt_blocks(self, key, data, algorithm="AES", output=None):
+        return _stream(self.ecb(key, algorithm).decrypt, data, output)
+
+    def encrypt(self, key, data, mode="ECB", algorithm="AES", output=None, **params):
+        cipher = self.cipher(key, mode, algorithm, **params)
+        out = _stream(cipher.encrypt, data, output)
+        if mode == "CBC":
+            return out, {"iv": cipher.iv}
+        if mode == "CTR":
+            return out, {"nonce": cipher.nonce}
+        if mode == "GCM":
+            return out, {"nonce": cipher.nonce, "tag": cipher.digest()}
+        return out, {}
+
+    def decrypt(self, key, data, mode="ECB", algorithm="AES", output=None, tag=None, **params):
+        if mode == "GCM" and tag is None:
+            raise ValueError("GCM decryption requires the tag.")
+        cipher = self.cipher(key, mode, algorithm, **params)
+        out = _stream(cipher.decrypt, data, output)
+        if mode == "GCM":
+            cipher.verify(tag)
+        return out
+
+
+# --- Helper: feed a buffer through the cipher in chunks without copying ---
+def _stream(fn, data, output=None):
+    src = memoryview(data).cast("B")
+    if output is None:
+        output = bytearray(len(src))
+    dst = memoryview(output).cast("B")
+    if len(dst) != len(src):
+        raise ValueError("Output buffer must match the input length.")
+    for start in range(0, len(src), CHUNK_SIZE):
+        end = start + CHUNK_SIZE
+        fn(src[start:end], output=dst[start:end])
+    return output
+
+
+default_cache = CipherCache()
@@ -0,0 +1,292 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from main import caesar_cipher, vigenere_cipher, monoalphabetic_cipher, playfair_cipher
+
+# SETTINGS
+ENGLISH_IOC = 0.0667
+RANDOM_IOC = 1 / 26
+ITERATIONS = 10000    # mutations tried per restart
+RESTARTS = 8
+MONO_START_TEMP = 8.0        # quadgram log-probabilities; Playfair needs a hotter start
+PLAYFAIR_START_TEMP = 30.0
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+PLAYFAIR_ALPHABET = "abcdefghiklmnopqrstuvwxyz"
+
+ENGLISH_FREQ = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]) / 100
+
+# Default scoring table: quadgram counts shipped next to this module. Pass a
+# table from build_ngram_table(corpus, n) to score with your own corpus.
+QUADGRAM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "english_quadgrams.txt")
+DEFAULT_N = 4
+
+
+# ----------------------- N-gram Scoring -----------------------
+
+def to_indices(text):
+    letters = np.frombuffer(text.lower().encode("ascii", "ignore"), dtype=np.uint8)
+    letters = letters[(letters >= 97) & (letters <= 122)]
+    return (letters - 97).astype(np.int64)
+
+
+def build_ngram_table(corpus, n=2):
+    idx = to_indices(corpus)
+    codes = ngram_codes(idx, n)
+    counts = np.bincount(codes, minlength=26 ** n).astype(np.float64) + 0.5
+    return np.log(counts / counts.sum())
+
+
+def ngram_codes(idx, n):
+    length = idx.shape[-1] - n + 1
+    codes = np.zeros(idx.shape[:-1] + (max(length, 0),), dtype=np.int64)
+    for k in range(n):
+        codes = codes * 26 + idx[..., k:k + length]
+    return codes
+
+
+def load_ngram_table(path, n=DEFAULT_N):
+    grams, counts = [], []
+    with open(path) as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            gram, count = line.split()
+            grams.append(gram)
+            counts.append(int(count))
+    codes = ngram_codes(to_indices("".join(grams)).reshape(-1, n), n)[:, 0]
+    table = np.full(26 ** n, 0.5)
+    table[codes] += counts
+    return np.log(table / table.sum())
+
+
+# Works on a single text (1-D) or a batch of candidate texts (2-D).
+def ngram_score(idx, table, n=DEFAULT_N):
+    return table[ngram_codes(idx, n)].sum(axis=-1)
+
+
+DEFAULT_TABLE = load_ngram_table(QUADGRAM_FILE)
+
+
+# ----------------------- Caesar -----------------------
+
+def crack_caesar(ciphertext, table=DEFAULT_TABLE, n=DEFAULT_N, top=3):
+    start = time.perf_counter()
+    idx = to_indices(ciphertext)
+    shifts = np.arange(26)
+    candidates = (idx[None, :] - shifts[:, None]) % 26
+    scores = ngram_score(candidates, table, n)
+    order = np.argsort(scores)[::-1][:top]
+    elapsed = time.perf_counter() - start
+    return {
+        "candidates": [(int(k), float(scores[k]), caesar_cipher(ciphertext, int(k), 'decrypt')) for k in order],
+        "candidates_per_sec": 26 / max(elapsed, 1e-9),
+    }
+
+
+# ----------------------- Vigenere -----------------------
+
+def index_of_coincidence(idx):
+    counts = np.bincount(idx, minlength=26)
+    total = counts.sum()
+    return float((counts * (counts - 1)).sum() / max(total * (total - 1), 1))
+
+
+def vigenere_key_lengths(ciphertext, max_length=20):
+    idx = to_indices(ciphertext)
+    ranked = []
+    for length in range(1, min(max_length, len(idx) // 2) + 1):
+        ioc = np.mean([index_of_coincidence(idx[i::length]) for i in range(length)])
+        ranked.append((length, float(ioc)))
+    # Multiples of the true length (and short columns) score just as well, so
+    # rank every English-looking length shortest first; crack_vigenere then
+    # settles between the leading lengths with the n-gram score.
+    ranked.sort(key=lambda x: (0, x[0]) if x[1] > ENGLISH_IOC - 0.01 else (1, -x[1]))
+    return ranked
+
+
+def chi_squared_shifts(column):
+    counts = np.bincount(column, minlength=26)
+    shifted = np.stack([np.roll(counts, -s) for s in range(26)])
+    expected = ENGLISH_FREQ * len(column)
+    return ((shifted - expected) ** 2 / expected).sum(axis=1)
+
+
+def crack_vigenere(ciphertext, max_length=20, table=DEFAULT_TABLE, n=DEFAULT_N):
+    start = time.perf_counter()
+    idx = to_indices(ciphertext)
+    results = []
+    scored = 0
+    for length, _ in vigenere_key_lengths(ciphertext, max_length)[:3]:
+        scored += 26 * length
+        key = "".join(ALPHABET[int(np.argmin(chi_squared_shifts(idx[i::length])))] for i in range(length))
+        plain = vigenere_cipher(ciphertext, key, 'decrypt')
+        results.append((key, float(ngram_score(to_indices(plain), table, n)), plain))
+    results.sort(key=lambda x: -x[1])
+    elapsed = time.perf_counter() - start
+    # Rate counts the column shifts actually scored with chi-squared.
+    return {"candidates": results, "candidates_per_sec": scored / max(elapsed, 1e-9)}
+
+
+# ----------------------- Simulated Annealing Workers -----------------------
+
+def _accept(delta, temp, rng):
+    return delta >= 0 or (temp > 0 and rng.random() < math.exp(delta / temp))
+
+
+# dec[c] is the plaintext letter for ciphertext letter c.
+def _anneal_mono(args):
+    idx, table, n, iterations, seed = args
+    rng = random.Random(seed)
+    dec = np.arange(26)
+    rng.shuffle(dec)
+    score = ngram_score(dec[idx], table, n)
+    best, best_score = dec.copy(), score
+    for i in range(iterations):
+        temp = MONO_START_TEMP * (1 - i / iterations)
+        a, b = rng.sample(range(26), 2)
+        dec[a], dec[b] = dec[b], dec[a]
+        new_score = ngram_score(dec[idx], table, n)
+        if _accept(new_score - score, temp, rng):
+            score = new_score
+            if score > best_score:
+                best, best_score = dec.copy(), score
+        else:
+            dec[a], dec[b] = dec[b], dec[a]
+    return float(best_score), best, iterations + 1
+
+
+def playfair_decrypt_indices(pairs, square):
+    pos = np.empty(26, dtype=np.int64)
+    pos[square] = np.arange(25)
+    r1, c1 = divmod(pos[pairs[:, 0]], 5)
+    r2, c2 = divmod(pos[pairs[:, 1]], 5)
+    same_row, same_col = r1 == r2, c1 == c2
+    out1 = np.where(same_row, r1 * 5 + (c1 - 1) % 5, np.where(same_col, ((r1 - 1) % 5) * 5 + c1, r1 * 5 + c2))
+    out2 = np.where(same_row, r2 * 5 + (c2 - 1) % 5, np.where(same_col, ((r2 - 1) % 5) * 5 + c2, r2 * 5 + c1))
+    return np.stack([square[out1], square[out2]], axis=1).ravel()
+
+
+def _mutate_square(square, rng):
+    grid = square.reshape(5, 5)
+    move = rng.random()
+    if move < 0.9:
+        a, b = rng.sample(range(25), 2)
+        square[a], square[b] = square[b], square[a]
+    elif move < 0.95:
+        a, b = rng.sample(range(5), 2)
+        grid[[a, b]] = grid[[b, a]]
+    else:
+        a, b = rng.sample(range(5), 2)
+        grid[:, [a, b]] = grid[:, [b, a]]
+
+
+def _anneal_playfair(args):
+    pairs, table, n, iterations, seed = args
+    rng = random.Random(seed)
+    square = to_indices(PLAYFAIR_ALPHABET)
+    rng.shuffle(square)
+    score = ngram_score(playfair_decrypt_indices(pairs, square), table, n)
+    best, best_score = square.copy(), score
+    for i in range(iterations):
+        temp = PLAYFAIR_START_TEMP * (1 - i / iterations)
+        candidate = square.copy()
+        _mutate_square(candidate, rng)
+        new_score = ngram_score(playfair_decrypt_indices(pairs, candidate), table, n)
+        if _accept(new_score - score, temp, rng):
+            square, score = candidate, new_score
+            if score > best_score:
+                best, best_score = square.copy(), score
+    return float(best_score), best, iterations + 1
+
+
+def _run_restarts(worker, payload, restarts, iterations, workers, seed):
+    rng = random.Random(seed)
+    jobs = [payload + (iterations, rng.randrange(1 << 30)) for _ in range(restarts)]
+    start = time.perf_counter()
+    if workers == 1:
+        results = [worker(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = list(pool.map(worker, jobs))
+    elapsed = time.perf_counter() - start
+    evaluated = sum(r[2] for r in results)
+    results.sort(key=lambda r: -r[0])
+    return results, evaluated / max(elapsed, 1e-9)
+
+
+# ----------------------- Monoalphabetic & Playfair -----------------------
+
+def crack_monoalphabetic(ciphertext, restarts=RESTARTS, iterations=ITERATIONS, workers=None,
+                         table=DEFAULT_TABLE, n=DEFAULT_N, seed=None):
+    idx = to_indices(ciphertext)
+    results, rate = _run_restarts(_anneal_mono, (idx, table, n), restarts, iterations, workers, seed)
+    candidates = []
+    for score, dec, _ in results:
+        # monoalphabetic_cipher keys map plaintext letter i to key[i].
+        key = [""] * 26
+        for c, p in enumerate(dec):
+            key[p] = ALPHABET[c]
+        key = "".join(key).upper()
+        candidates.append((key, score, monoalphabetic_cipher(ciphertext, key, 'decrypt')))
+    return {"candidates": candidates, "candidates_per_sec": rate}
+
+
+def crack_playfair(ciphertext, restarts=RESTARTS, iterations=ITERATIONS, workers=None,
+                   table=DEFAULT_TABLE, n=DEFAULT_N, seed=None):
+    idx = to_indices(ciphertext.replace("j", "i").replace("J", "I"))
+    if len(idx) % 2:
+        raise ValueError("Playfair ciphertext must have an even number of letters.")
+    pairs = idx.reshape(-1, 2)
+    results, rate = _run_restarts(_anneal_playfair, (pairs, table, n), restarts, iterations, workers, seed)
+    letters = "".join(ALPHABET[i] for i in idx)
+    candidates = []
+    for score, square, _ in results:
+        key = "".join(ALPHABET[i] for i in square)
+        candidates.append((key, score, playfair_cipher(letters, key, 'decrypt')[0]))
+    return {"candidates": candidates, "candidates_per_sec": rate}
+
+
+# ----------------------- Run All -----------------------
+
+def main():
+    text = ("When the travellers reached the top of the hill they could see the whole valley below them. "
+            "The river ran through the middle of the fields and the roofs of the town were bright in the "
+            "afternoon sun. They stopped to rest by the road and one of them took out a map to find the way "
+            "to the harbour, where a ship was waiting to carry them along the coast to the city before the "
+            "winter storms arrived and closed the sea for the rest of the year.")
+
+    print("=" * 50)
+    print("CAESAR")
+    result = crack_caesar(caesar_cipher(text, 11))
+    key, score, plain = result["candidates"][0]
+    print(f"Key {key} ({result['candidates_per_sec']:,.0f} candidates/s): {plain}")
+
+    print("\n" + "=" * 50)
+    print("VIGENERE")
+    result = crack_vigenere(vigenere_cipher(text, "SECRET"))
+    key, score, plain = result["candidates"][0]
+    print(f"Key {key} ({result['candidates_per_sec']:,.0f} shifts/s): {plain}")
+
+    print("\n" + "=" * 50)
+    print("MONOALPHABETIC")
+    result = crack_monoalphabetic(monoalphabetic_cipher(text, "QWERTYUIOPASDFGHJKLZXCVBNM"))
+    key, score, plain = result["candidates"][0]
+    # Letters that never occur in the text (here j, q, x, z) cannot be recovered.
+    print(f"Key {key} ({result['candidates_per_sec']:,.0f} candidates/s, plaintext exact: {plain == text}): {plain}")
+
+    print("\n" + "=" * 50)
+    print("PLAYFAIR")
+    result = crack_playfair(playfair_cipher(text, "fortify")[0], iterations=4 * ITERATIONS)
+    key, score, plain = result["candidates"][0]
+    print(f"Key {key} ({result['candidates_per_sec']:,.0f} candidates/s): {plain}")
+
+
+if __name__ == "__main__":
+    main()
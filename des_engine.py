@@ -0,0 +1,243 @@
+import os
+import time
+import binascii
+from Crypto.Cipher import DES
+from main import IP_TABLE, E_TABLE, permute
+
+# ----------------------- DES Tables -----------------------
+
+FP_TABLE = [IP_TABLE.index(i) + 1 for i in range(1, 65)]
+
+P_TABLE = [16, 7, 20, 21, 29, 12, 28, 17, 1, 15, 23, 26, 5, 18, 31, 10,
+           2, 8, 24, 14, 32, 27, 3, 9, 19, 13, 30, 6, 22, 11, 4, 25]
+
+PC1_TABLE = [57, 49, 41, 33, 25, 17, 9, 1, 58, 50, 42, 34, 26, 18,
+             10, 2, 59, 51, 43, 35, 27, 19, 11, 3, 60, 52, 44, 36,
+             63, 55, 47, 39, 31, 23, 15, 7, 62, 54, 46, 38, 30, 22,
+             14, 6, 61, 53, 45, 37, 29, 21, 13, 5, 28, 20, 12, 4]
+
+PC2_TABLE = [14, 17, 11, 24, 1, 5, 3, 28, 15, 6, 21, 10,
+             23, 19, 12, 4, 26, 8, 16, 7, 27, 20, 13, 2,
+             41, 52, 31, 37, 47, 55, 30, 40, 51, 45, 33, 48,
+             44, 49, 39, 56, 34, 53, 46, 42, 50, 36, 29, 32]
+
+SHIFTS = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
+
+S_BOXES = [
+    [[14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7],
+     [0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8],
+     [4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0],
+     [15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13]],
+    [[15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10],
+     [3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5],
+     [0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15],
+     [13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9]],
+    [[10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8],
+     [13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1],
+     [13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7],
+     [1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12]],
+    [[7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15],
+     [13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9],
+     [10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4],
+     [3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14]],
+    [[2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9],
+     [14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6],
+     [4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14],
+     [11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3]],
+    [[12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11],
+     [10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8],
+     [9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6],
+     [4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13]],
+    [[4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1],
+     [13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6],
+     [1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2],
+     [6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12]],
+    [[13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7],
+     [1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2],
+     [7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8],
+     [2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11]],
+]
+
+
+# ----------------------- Precomputed Lookup Tables -----------------------
+
+# For a permutation of an n-bit input, one 256-entry table per input byte maps
+# that byte straight to its scattered output bits, so a permutation is
+# n/8 lookups OR-ed together instead of a per-bit loop.
+def build_permutation(table, in_bits):
+    out_bits = len(table)
+    tables = []
+    for byte in range(in_bits // 8):
+        entries = []
+        for value in range(256):
+            out = 0
+            for pos, src in enumerate(table):
+                src -= 1
+                if src // 8 == byte and value >> (7 - src % 8) & 1:
+                    out |= 1 << (out_bits - 1 - pos)
+            entries.append(out)
+        tables.append(entries)
+    return tables
+
+
+def apply_permutation(tables, value):
+    out, shift = 0, 8 * (len(tables) - 1)
+    for entries in tables:
+        out |= entries[(value >> shift) & 0xFF]
+        shift -= 8
+    return out
+
+
+IP = build_permutation(IP_TABLE, 64)
+FP = build_permutation(FP_TABLE, 64)
+E = build_permutation(E_TABLE, 32)
+PC1 = build_permutation(PC1_TABLE, 64)
+PC2 = build_permutation(PC2_TABLE, 56)
+P = build_permutation(P_TABLE, 32)
+
+
+# S-box output already pushed through P, so f() is eight lookups and no P step.
+def build_sp_boxes():
+    sp = []
+    for i, box in enumerate(S_BOXES):
+        entries = []
+        for six in range(64):
+            row = (six >> 4 & 2) | (six & 1)
+            col = six >> 1 & 0xF
+            entries.append(apply_permutation(P, box[row][col] << (28 - 4 * i)))
+        sp.append(entries)
+    return sp
+
+
+SP = build_sp_boxes()
+
+
+# ----------------------- Key Schedule -----------------------
+
+def des_subkeys(key):
+    cd = apply_permutation(PC1, int.from_bytes(key, "big"))
+    c, d = cd >> 28, cd & 0xFFFFFFF
+    subkeys = []
+    for s in SHIFTS:
+        c = ((c << s) | (c >> (28 - s))) & 0xFFFFFFF
+        d = ((d << s) | (d >> (28 - s))) & 0xFFFFFFF
+        subkeys.append(apply_permutation(PC2, (c << 28) | d))
+    return subkeys
+
+
+# ----------------------- Rounds -----------------------
+
+def feistel(r, k):
+    x = apply_permutation(E, r) ^ k
+    s0, s1, s2, s3, s4, s5, s6, s7 = SP
+    return (s0[x >> 42 & 63] | s1[x >> 36 & 63] | s2[x >> 30 & 63] | s3[x >> 24 & 63] |
+            s4[x >> 18 & 63] | s5[x >> 12 & 63] | s6[x >> 6 & 63] | s7[x & 63])
+
+
+def des_block(block, subkeys, trace=False):
+    x = apply_permutation(IP, block)
+    left, right = x >> 32, x & 0xFFFFFFFF
+    if trace:
+        print(f"IP:       L0={left:08x} R0={right:08x}")
+    for i, k in enumerate(subkeys, 1):
+        left, right = right, left ^ feistel(right, k)
+        if trace:
+            print(f"Round {i:2d}: K={k:012x} L={left:08x} R={right:08x}")
+    return apply_permutation(FP, (right << 32) | left)
+
+
+def des_encrypt(data, key, trace=False):
+    subkeys = des_subkeys(key)
+    return _run_blocks(data, subkeys, trace)
+
+
+def des_decrypt(data, key, trace=False):
+    subkeys = des_subkeys(key)[::-1]
+    return _run_blocks(data, subkeys, trace)
+
+
+def _run_blocks(data, subkeys, trace):
+    if len(data) % 8:
+        raise ValueError("Data must be a multiple of 8 bytes.")
+    out = bytearray(len(data))
+    for i in range(0, len(data), 8):
+        block = int.from_bytes(data[i:i + 8], "big")
+        out[i:i + 8] = des_block(block, subkeys, trace).to_bytes(8, "big")
+    return bytes(out)
+
+
+# ----------------------- Validation & Benchmark -----------------------
+
+def verify_against_pycryptodome(trials=200):
+    for _ in range(trials):
+        key, block = os.urandom(8), os.urandom(8)
+        expected = DES.new(key, DES.MODE_ECB).encrypt(block)
+        if des_encrypt(block, key) != expected or des_decrypt(expected, key) != block:
+            raise AssertionError(f"Mismatch for key={key.hex()} block={block.hex()}")
+    return trials
+
+
+# One full round (IP, E, key XOR, S-boxes, P, swap) done the string-based way
+# des_one_round_demo works, so it does the same work as table_round.
+def string_round(plaintext_hex, subkey_bits):
+    pt = bin(int(plaintext_hex, 16))[2:].zfill(64)
+    ptext = permute(pt, IP_TABLE)
+    L0, R0 = ptext[:32], ptext[32:]
+    x = bin(int(permute(R0, E_TABLE), 2) ^ int(subkey_bits, 2))[2:].zfill(48)
+    sbox_out = ""
+    for i in range(8):
+        six = x[6 * i:6 * i + 6]
+        sbox_out += bin(S_BOXES[i][int(six[0] + six[5], 2)][int(six[1:5], 2)])[2:].zfill(4)
+    f = permute(sbox_out, P_TABLE)
+    return R0, bin(int(L0, 2) ^ int(f, 2))[2:].zfill(32)
+
+
+def table_round(block, subkey):
+    x = apply_permutation(IP, block)
+    left, right = x >> 32, x & 0xFFFFFFFF
+    return right, left ^ feistel(right, subkey)
+
+
+def benchmark(iterations=20000):
+    pt_hex, key_hex = "0123456789ABCDEF", "133457799BBCDFF1"
+    block, key = int(pt_hex, 16), binascii.unhexlify(key_hex)
+    subkeys = des_subkeys(key)
+    subkey_bits = bin(subkeys[0])[2:].zfill(48)
+    data = os.urandom(8 * 1024)
+
+    # Both paths start from the same block and round-1 subkey and must agree.
+    left, right = table_round(block, subkeys[0])
+    if string_round(pt_hex, subkey_bits) != (f"{left:032b}", f"{right:032b}"):
+        raise AssertionError("String and table rounds disagree.")
+
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        string_round(pt_hex, subkey_bits)
+    string_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        table_round(block, subkeys[0])
+    table_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    _run_blocks(data, subkeys, False)
+    full_time = time.perf_counter() - t0
+
+    print(f"String round:  {iterations / string_time:,.0f} rounds/s")
+    print(f"Table round:   {iterations / table_time:,.0f} rounds/s "
+          f"({string_time / table_time:.1f}x faster)")
+    print(f"Full 16-round: {len(data) / 8 / full_time:,.0f} blocks/s")
+
+
+def main():
+    print("--- DES 16 Rounds (traced) ---")
+    key = binascii.unhexlify("133457799BBCDFF1")
+    enc = des_encrypt(binascii.unhexlify("0123456789ABCDEF"), key, trace=True)
+    print(f"Encrypted: {enc.hex()}")
+    print(f"Verified {verify_against_pycryptodome()} random blocks against PyCryptodome")
+    benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import json
+import os
+import cv2
+import mediapipe as mp
+import numpy as np
+from proctor_logic import (GRACE_PERIOD, NOSE_BOUNDS, IRIS_BOUNDS,
+                           landmarks_to_array, nose_looking_away, gaze_centered)
+from violation_scorer import violation_frames
+
+# SETTINGS
+CACHE_ROOT = ".detection_cache"
+MAX_FACES = 8                  # Haar boxes stored per frame; the true count is kept separately
+HASH_CHUNK = 1 << 20
+
+DEFAULT_CONFIG = {
+    "flip": True,
+    "resize": None,                                        # e.g. [900, 700] as in read3.py/read4.py
+    "haar": {"scale_factor": 1.3, "min_neighbors": 5, "min_size": None},
+    "face_mesh": {"refine_landmarks": True},
+    "landmark_dtype": "float16",
+}
+
+# Per-frame state values; PAST_END marks frames CAP_PROP_FRAME_COUNT promised but the decoder never delivered
+MISSING, DONE, PAST_END = 0, 1, 2
+
+
+# ----------------------- Keys -----------------------
+
+# Content hash of the video, memoised on (size, mtime) so re-runs skip re-reading it.
+def video_hash(path, root=CACHE_ROOT):
+    st = os.stat(path)
+    memo_path = os.path.join(root, "hashes.json")
+    memo = {}
+    if os.path.exists(memo_path):
+        with open(memo_path) as f:
+            memo = json.load(f)
+    memo_key = f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+    if memo_key in memo:
+        return memo[memo_key]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    memo[memo_key] = h.hexdigest()
+    os.makedirs(root, exist_ok=True)
+    with open(memo_path, "w") as f:
+        json.dump(memo, f)
+    return memo[memo_key]
+
+
+# Only detector settings go into the key; decision thresholds are applied on replay.
+def config_key(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+# ----------------------- Cache Storage -----------------------
+
+class DetectionCache:
+    def __init__(self, directory, frames, fps, config):
+        self.directory = directory
+        self.config = config
+        num_landmarks = 478 if config["face_mesh"] and config["face_mesh"].get("refine_landmarks") else 468
+        meta_path = os.path.join(directory, "meta.json")
+        exists = os.path.exists(meta_path)
+        mode = "r+" if exists else "w+"
+        os.makedirs(directory, exist_ok=True)
+
+        def column(name, dtype, shape):
+            return np.lib.format.open_memmap(os.path.join(directory, name + ".npy"), mode=mode,
+                                             dtype=dtype, shape=None if exists else shape)
+
+        self.state = column("state", np.uint8, (frames,))
+        self.face_counts = column("face_counts", np.uint8, (frames,))
+        self.boxes = column("boxes", np.int16, (frames, MAX_FACES, 4))
+        self.has_landmarks = column("has_landmarks", np.bool_, (frames,))
+        self.landmarks = column("landmarks", config["landmark_dtype"], (frames, num_landmarks, 3))
+        if not exists:
+            with open(meta_path, "w") as f:
+                json.dump({"frames": frames, "fps": fps, "config": config}, f, indent=2)
+            self.fps = fps
+        else:
+            with open(meta_path) as f:
+                self.fps = json.load(f)["fps"]
+
+    def __len__(self):
+        return len(self.state)
+
+    def missing(self):
+        return np.flatnonzero(self.state == MISSING)
+
+    def put(self, index, boxes, landmarks):
+        count = min(len(boxes), 255)
+        self.face_counts[index] = count
+        self.boxes[index] = 0
+        if count:
+            self.boxes[index, :min(count, MAX_FACES)] = np.asarray(boxes)[:MAX_FACES]
+        self.has_landmarks[index] = landmarks is not None
+        if landmarks is not None:
+            self.landmarks[index] = landmarks
+        self.state[index] = DONE
+
+    def mark_end(self, index):
+        self.state[index:][self.state[index:] == MISSING] = PAST_END
+
+    def flush(self):
+        for column in (self.state, self.face_counts, self.boxes, self.has_landmarks, self.landmarks):
+            column.flush()
+
+
+def open_cache(video_path, config=DEFAULT_CONFIG, root=CACHE_ROOT):
+    cap = cv2.VideoCapture(video_path)
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    directory = os.path.join(root, video_hash(video_path, root), config_key(config))
+    return DetectionCache(directory, frames, fps, config)
+
+
+# ----------------------- Filling the Cache -----------------------
+
+def fill_cache(video_path, config=DEFAULT_CONFIG, root=CACHE_ROOT):
+    cache = open_cache(video_path, config, root)
+    todo = set(cache.missing().tolist())
+    if not todo:
+        return cache
+
+    haar = config["haar"]
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml") if haar else None
+    face_mesh = mp.solutions.face_mesh.FaceMesh(**config["face_mesh"]) if config["face_mesh"] else None
+
+    cap = cv2.VideoCapture(video_path)
+    index = 0
+    while todo and index < len(cache):
+        if index not in todo:
+            # grab() skips decoding for frames that are already cached
+            if not cap.grab():
+                cache.mark_end(index)
+                break
+            index += 1
+            continue
+        ret, frame = cap.read()
+        if not ret:
+            cache.mark_end(index)
+            break
+        if config["flip"]:
+            frame = cv2.flip(frame, 1)
+        if config["resize"]:
+            frame = cv2.resize(frame, tuple(config["resize"]))
+
+        boxes = []
+        if face_cascade is not None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            kwargs = {"scaleFactor": haar["scale_factor"], "minNeighbors": haar["min_neighbors"]}
+            if haar.get("min_size"):
+                kwargs["minSize"] = tuple(haar["min_size"])
+            boxes = face_cascade.detectMultiScale(gray, **kwargs)
+
+        landmarks = None
+        if face_mesh is not None:
+            results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if results.multi_face_landmarks:
+                landmarks = landmarks_to_array(results.multi_face_landmarks[0].landmark)
+
+        cache.put(index, boxes, landmarks)
+        todo.discard(index)
+        index += 1
+
+    cap.release()
+    cache.flush()
+    return cache
+
+
+# ----------------------- Replay -----------------------
+
+# --- Helper: per-frame away/status decisions for the cached frames ---
+def _decide(cache, nose_bounds, iris_bounds, use_gaze):
+    done = cache.state[:] == DONE
+    has_face = np.asarray(cache.has_landmarks) & done
+    lm = cache.landmarks
+    away = ~has_face | nose_looking_away(lm, nose_bounds)
+    if use_gaze:
+        away |= ~gaze_centered(lm, iris_bounds)
+    status = np.where(~has_face, "No Face Detected", np.where(away, "Looking Away", "Centered"))
+    return done, away, status, np.flatnonzero(done)
+
+
+# Re-applies the read.py/read5.py decision logic to cached detections.
+def replay(cache, grace_period=GRACE_PERIOD, nose_bounds=NOSE_BOUNDS, iris_bounds=IRIS_BOUNDS, use_gaze=False):
+    done, away, status, frames = _decide(cache, nose_bounds, iris_bounds, use_gaze)
+    fired = frames[violation_frames(frames / cache.fps, away[frames], [grace_period])[0]]
+    violations = [(int(i) / cache.fps, str(status[i])) for i in fired]
+    return {"frames": int(done.sum()), "violations": violations, "looking_away": away & done}
+
+
+# Decisions are made once per nose_bounds; violation_frames scores every grace period in one pass.
+def sweep(cache, grace_periods, nose_bounds_list=(NOSE_BOUNDS,), use_gaze=False):
+    rows = []
+    for nose_bounds in nose_bounds_list:
+        _, away, _, frames = _decide(cache, nose_bounds, IRIS_BOUNDS, use_gaze)
+        fired = violation_frames(frames / cache.fps, away[frames], list(grace_periods))
+        for grace_period, frames_fired in zip(grace_periods, fired):
+            rows.append({"grace_period": grace_period, "nose_bounds": list(nose_bounds),
+                         "violations": len(frames_fired)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache detections for a recording and sweep thresholds.")
+    parser.add_argument("video")
+    parser.add_argument("--root", default=CACHE_ROOT)
+    parser.add_argument("--grace", type=float, nargs="+", default=[1, 2, 3, 5])
+    args = parser.parse_args()
+
+    cache = fill_cache(args.video, DEFAULT_CONFIG, args.root)
+    print(f"[INFO] {int((cache.state[:] == DONE).sum())} frames cached in {cache.directory}")
+    for row in sweep(cache, args.grace, [(0.3, 0.7), (0.25, 0.75)]):
+        print(f"Grace {row['grace_period']}s, nose {row['nose_bounds']}: {row['violations']} violations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import queue
+import re
+import threading
+import time
+import cv2
+import numpy as np
+
+# SETTINGS
+PRE_SECONDS = 5         # seconds of video kept before a violation
+POST_SECONDS = 3        # seconds recorded after it
+MAX_FPS = 30            # sizes the ring buffer
+SCALE = 0.5             # frames are downscaled by this factor before buffering
+MAX_PENDING = 2         # finished clips waiting for the encoder before new ones are dropped
+FOURCC = "mp4v"
+
+
+# ----------------------- Ring-buffered Clip Recorder -----------------------
+
+class EvidenceRecorder:
+    # push() writes each (downscaled) frame straight into a preallocated ring;
+    # nothing touches the disk until trigger() fires and the post window ends.
+    def __init__(self, output_dir="evidence", pre_seconds=PRE_SECONDS, post_seconds=POST_SECONDS,
+                 max_fps=MAX_FPS, scale=SCALE, max_pending=MAX_PENDING):
+        self.output_dir = output_dir
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.scale = scale
+        self.capacity = int((pre_seconds + post_seconds) * max_fps) + 1
+        self.frames = None
+        self.times = np.zeros(self.capacity)
+        self.count = 0                  # total frames pushed
+        self.event = None               # (label, trigger time, end time, first frame index)
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.stats = {"clips": 0, "dropped": 0, "split": 0, "truncated": 0}
+        self.writer_thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.writer_thread.start()
+
+    def push(self, frame, now):
+        if self.frames is None:
+            h, w = frame.shape[:2]
+            size = (max(int(w * self.scale), 2) // 2 * 2, max(int(h * self.scale), 2) // 2 * 2)
+            self.frames = np.empty((self.capacity, size[1], size[0], 3), dtype=np.uint8)
+        # The ring is about to overwrite the clip's first frame: close the clip
+        # here and continue the same event in a new one, so nothing is lost.
+        if self.event and self.count - self.event[3] >= self.capacity:
+            label, _, end, _ = self.event
+            self._finish_event()
+            self.event = (label, now, end, self.count)
+            self.stats["split"] += 1
+        slot = self.count % self.capacity
+        cv2.resize(frame, (self.frames.shape[2], self.frames.shape[1]), dst=self.frames[slot],
+                   interpolation=cv2.INTER_AREA)
+        self.times[slot] = now
+        self.count += 1
+        if self.event and now >= self.event[2]:
+            self._finish_event()
+
+    # Overlapping violations extend the current clip instead of starting another.
+    def trigger(self, label, now):
+        if self.event:
+            self.event = (self.event[0], self.event[1], now + self.post_seconds, self.event[3])
+        else:
+            first = self.count
+            while first > max(self.count - self.capacity, 0) and now - self.times[(first - 1) % self.capacity] <= self.pre_seconds:
+                first -= 1
+            self.event = (label, now, now + self.post_seconds, first)
+
+    def _finish_event(self):
+        label, started, _, first = self.event
+        self.event = None
+        if first < self.count - self.capacity:
+            self.stats["truncated"] += 1
+            first = self.count - self.capacity
+        order = np.arange(first, self.count) % self.capacity
+        if len(order) == 0:
+            return
+        try:
+            # The copy is what leaves the ring, so its size is bounded by the ring.
+            self.pending.put_nowait((label, started, self.frames[order], self.times[order]))
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _encode_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            label, started, frames, times = item
+            duration = times[-1] - times[0]
+            fps = min((len(times) - 1) / duration, MAX_FPS) if duration > 0 else MAX_FPS
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(started))
+            name = f"evidence_{stamp}_{re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_')}.mp4"
+            writer = cv2.VideoWriter(os.path.join(self.output_dir, name), cv2.VideoWriter_fourcc(*FOURCC),
+                                     fps, (frames.shape[2], frames.shape[1]))
+            if not writer.isOpened():
+                self.stats["dropped"] += 1
+                continue
+            for frame in frames:
+                writer.write(frame)
+            writer.release()
+            self.stats["clips"] += 1
+
+    def close(self):
+        if self.event:
+            self._finish_event()
+        self.pending.put(None)
+        self.writer_thread.join()
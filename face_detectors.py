@@ -0,0 +1,226 @@
+import argparse
+import collections
+import os
+import time
+import cv2
+import numpy as np
+
+# SETTINGS
+MODEL_DIR = "models"
+YUNET_MODEL = os.path.join(MODEL_DIR, "face_detection_yunet_2023mar.onnx")
+SSD_PROTOTXT = os.path.join(MODEL_DIR, "deploy.prototxt")
+SSD_WEIGHTS = os.path.join(MODEL_DIR, "res10_300x300_ssd_iter_140000.caffemodel")
+SCORE_THRESHOLD = 0.6
+MAX_WIDTH = 640             # DNN backends run on frames downscaled to at most this width
+IOU_MATCH = 0.3             # boxes overlapping at least this much count as the same face
+HAAR_WEIGHT_MIDPOINT = 2.0  # Haar final-stage level weight that maps to a score of 0.5
+
+# Common result type: pixel box in the input frame plus a confidence in [0, 1]
+# (for Haar, a logistic of the cascade's final-stage level weight).
+Face = collections.namedtuple("Face", ["x", "y", "w", "h", "score"])
+
+
+# --- Helper: DNN backends detect on a downscaled copy and scale boxes back ---
+def _downscale(frame, max_width):
+    h, w = frame.shape[:2]
+    if not max_width or w <= max_width:
+        return frame, 1.0
+    scale = max_width / w
+    return cv2.resize(frame, (max_width, int(h * scale)), interpolation=cv2.INTER_AREA), scale
+
+
+def _to_faces(boxes, scores, scale, frame_shape):
+    h, w = frame_shape[:2]
+    faces = []
+    for (x, y, bw, bh), score in zip(boxes, scores):
+        x0, y0 = max(int(x / scale), 0), max(int(y / scale), 0)
+        x1, y1 = min(int((x + bw) / scale), w), min(int((y + bh) / scale), h)
+        if x1 > x0 and y1 > y0:
+            faces.append(Face(x0, y0, x1 - x0, y1 - y0, float(score)))
+    return faces
+
+
+# ----------------------- Backends -----------------------
+
+# Every backend is a callable frame -> [Face], so it drops into timed_detect()
+# and ChangeFilter.run() wherever a detect function was used before.
+class HaarDetector:
+    name = "haar"
+
+    def __init__(self, scale_factor=1.3, min_neighbors=5, min_size=(0, 0), cascade="haarcascade_frontalface_default.xml"):
+        self.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + cascade)
+        if self.cascade.empty():
+            raise FileNotFoundError(f"Could not load Haar cascade {cascade}")
+        self.params = {"scaleFactor": scale_factor, "minNeighbors": min_neighbors, "minSize": tuple(min_size)}
+
+    def __call__(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        boxes, _, weights = self.cascade.detectMultiScale3(gray, outputRejectLevels=True, **self.params)
+        scores = 1.0 / (1.0 + np.exp(HAAR_WEIGHT_MIDPOINT - np.ravel(weights)))
+        return _to_faces(boxes, scores, 1.0, frame.shape)
+
+
+class YuNetDetector:
+    name = "yunet"
+
+    def __init__(self, model_path=YUNET_MODEL, score_threshold=SCORE_THRESHOLD, max_width=MAX_WIDTH):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"YuNet model not found at {model_path} (download it from the OpenCV model zoo).")
+        self.model_path = model_path
+        self.score_threshold = score_threshold
+        self.max_width = max_width
+        self.detector = None
+        self.input_size = None
+
+    def __call__(self, frame):
+        small, scale = _downscale(frame, self.max_width)
+        size = (small.shape[1], small.shape[0])
+        if self.detector is None:
+            self.detector = cv2.FaceDetectorYN.create(self.model_path, "", size, self.score_threshold)
+        if size != self.input_size:
+            self.detector.setInputSize(size)
+            self.input_size = size
+        _, detections = self.detector.detect(small)
+        if detections is None:
+            return []
+        return _to_faces(detections[:, :4], detections[:, -1], scale, frame.shape)
+
+
+class SsdDetector:
+    name = "ssd"
+
+    def __init__(self, prototxt=SSD_PROTOTXT, weights=SSD_WEIGHTS, score_threshold=SCORE_THRESHOLD):
+        for path in (prototxt, weights):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"SSD model file not found at {path}")
+        self.net = cv2.dnn.readNetFromCaffe(prototxt, weights)
+        self.score_threshold = score_threshold
+
+    def __call__(self, frame):
+        h, w = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(cv2.resize(frame, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+        detections = detections[detections[:, 2] >= self.score_threshold]
+        corners = detections[:, 3:7] * np.array([w, h, w, h])
+        boxes = np.column_stack((corners[:, :2], corners[:, 2:] - corners[:, :2]))
+        return _to_faces(boxes, detections[:, 2], 1.0, frame.shape)
+
+
+class MediaPipeDetector:
+    name = "mediapipe"
+
+    def __init__(self, score_threshold=SCORE_THRESHOLD, model_selection=0):
+        import mediapipe as mp
+        self.detector = mp.solutions.face_detection.FaceDetection(
+            model_selection=model_selection, min_detection_confidence=score_threshold)
+
+    def __call__(self, frame):
+        h, w = frame.shape[:2]
+        results = self.detector.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if not results.detections:
+            return []
+        boxes, scores = [], []
+        for detection in results.detections:
+            box = detection.location_data.relative_bounding_box
+            boxes.append((box.xmin * w, box.ymin * h, box.width * w, box.height * h))
+            scores.append(detection.score[0])
+        return _to_faces(boxes, scores, 1.0, frame.shape)
+
+
+BACKENDS = {cls.name: cls for cls in (HaarDetector, YuNetDetector, SsdDetector, MediaPipeDetector)}
+
+
+def create_detector(name, **kwargs):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown detector backend: {name} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
+
+
+# --- Helper: draw detected faces ---
+def draw_faces(frame, faces, color=(0, 255, 0)):
+    for face in faces:
+        cv2.rectangle(frame, (face.x, face.y), (face.x + face.w, face.y + face.h), color, 2)
+
+
+# ----------------------- Benchmark -----------------------
+
+def iou(a, b):
+    x0, y0 = max(a.x, b.x), max(a.y, b.y)
+    x1, y1 = min(a.x + a.w, b.x + b.w), min(a.y + a.h, b.y + b.h)
+    inter = max(x1 - x0, 0) * max(y1 - y0, 0)
+    union = a.w * a.h + b.w * b.h - inter
+    return inter / union if union else 0.0
+
+
+# Number of reference faces that have a detection overlapping them.
+def _matched(reference, faces):
+    return sum(any(iou(r, f) >= IOU_MATCH for f in faces) for r in reference)
+
+
+def benchmark_clip(path, detectors, reference):
+    cap = cv2.VideoCapture(path)
+    results = {name: {"latency": [], "cpu": 0.0, "state_agree": 0, "matched": 0, "faces": 0}
+               for name in detectors}
+    ref_faces_total = 0
+    frames = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames += 1
+        found = {}
+        for name, detect in detectors.items():
+            t0, c0 = time.perf_counter(), time.process_time()
+            found[name] = detect(frame)
+            results[name]["latency"].append(time.perf_counter() - t0)
+            results[name]["cpu"] += time.process_time() - c0
+            results[name]["faces"] += len(found[name])
+        ref = found[reference]
+        ref_faces_total += len(ref)
+        for name, faces in found.items():
+            results[name]["state_agree"] += min(len(faces), 2) == min(len(ref), 2)
+            results[name]["matched"] += _matched(ref, faces)
+    cap.release()
+
+    report = {}
+    for name, r in results.items():
+        latency = np.array(r["latency"]) * 1000 if r["latency"] else np.zeros(1)
+        report[name] = {
+            "frames": frames,
+            "mean_ms": float(latency.mean()),
+            "p95_ms": float(np.percentile(latency, 95)),
+            "cpu_s": r["cpu"],
+            "faces_per_frame": r["faces"] / max(frames, 1),
+            "state_agreement": r["state_agree"] / max(frames, 1),
+            "box_recall": r["matched"] / ref_faces_total if ref_faces_total else 1.0,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare face detector backends on the same clips.")
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--backends", nargs="+", default=["haar", "yunet", "mediapipe"], choices=list(BACKENDS))
+    parser.add_argument("--reference", default="haar", help="backend the others are compared against")
+    args = parser.parse_args()
+
+    detectors = {}
+    for name in dict.fromkeys([args.reference] + args.backends):
+        try:
+            detectors[name] = create_detector(name)
+        except (FileNotFoundError, ImportError, AttributeError) as e:
+            print(f"[WARN] Skipping {name}: {e}")
+    if args.reference not in detectors:
+        parser.error(f"Reference backend {args.reference} is unavailable.")
+
+    for path in args.clips:
+        print(f"\n[INFO] {path} (reference: {args.reference})")
+        print(f"{'Backend':12s} {'Mean ms':>8s} {'p95 ms':>8s} {'CPU s':>8s} {'Faces/f':>8s} {'Agree':>7s} {'Recall':>7s}")
+        for name, r in benchmark_clip(path, detectors, args.reference).items():
+            print(f"{name:12s} {r['mean_ms']:8.2f} {r['p95_ms']:8.2f} {r['cpu_s']:8.2f} {r['faces_per_frame']:8.2f} "
+                  f"{r['state_agreement'] * 100:6.1f}% {r['box_recall'] * 100:6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import numpy as np
+from proctor_logic import NOSE_TIP, NOSE_BOUNDS
+
+# SETTINGS
+FLUSH_EVERY = 64     # frames buffered in memory before the column files are appended
+
+# Per-frame verdict codes, matching the status_text values in read.py/read5.py
+CENTERED, LOOKING_AWAY, NO_FACE = 0, 1, 2
+VERDICTS = {"Centered": CENTERED, "Looking Away": LOOKING_AWAY, "No Face Detected": NO_FACE}
+
+INTERVAL_DTYPE = np.dtype([("start", "<u4"), ("end", "<u4"), ("start_time", "<f8"),
+                           ("end_time", "<f8"), ("violations", "<u2")])
+
+
+def column_specs(num_landmarks, landmark_dtype):
+    return {
+        "timestamps": ("<f8", ()),
+        "landmarks": (np.dtype(landmark_dtype).newbyteorder("<").str, (num_landmarks, 3)),
+        "has_face": ("|u1", ()),
+        "boxes": ("<i2", (4,)),
+        "verdicts": ("|u1", ()),
+        "violations": ("|u1", ()),
+    }
+
+
+# ----------------------- Writer -----------------------
+
+# Each column is a raw little-endian file with a fixed row stride, so files
+# only ever grow and a crash loses at most the unflushed tail.
+class SessionWriter:
+    def __init__(self, path, num_landmarks=478, landmark_dtype="float16"):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.specs = column_specs(num_landmarks, landmark_dtype)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.specs = {k: (v[0], tuple(v[1])) for k, v in meta["columns"].items()}
+        else:
+            with open(meta_path, "w") as f:
+                json.dump({"version": 1, "columns": self.specs}, f, indent=2)
+        # Drop any partially written tail so every column resumes on the same row.
+        self.frames = _committed_rows(path, self.specs)
+        for name, (dtype, shape) in self.specs.items():
+            file_path = os.path.join(path, name + ".bin")
+            if os.path.exists(file_path):
+                os.truncate(file_path, self.frames * _stride(dtype, shape))
+        self.files = {name: open(os.path.join(path, name + ".bin"), "ab") for name in self.specs}
+        intervals_path = os.path.join(path, "intervals.bin")
+        if os.path.exists(intervals_path):
+            os.truncate(intervals_path, _committed_intervals(intervals_path, self.frames) * INTERVAL_DTYPE.itemsize)
+        self.intervals = open(intervals_path, "ab")
+        self.buffers = {name: [] for name in self.specs}
+        self._run_start = None
+        self._run_violations = 0
+        self._last_time = 0.0
+        if self.frames:
+            self._resume_run(intervals_path)
+
+    # A look-away run still open when the previous writer died continues
+    # from the recovered columns, unless close() already indexed it.
+    def _resume_run(self, intervals_path):
+        verdicts = self._read_column("verdicts")
+        timestamps = self._read_column("timestamps")
+        self._last_time = float(timestamps[-1])
+        centered = np.flatnonzero(verdicts == CENTERED)
+        start = int(centered[-1]) + 1 if len(centered) else 0
+        if start == self.frames:
+            return
+        intervals = np.fromfile(intervals_path, dtype=INTERVAL_DTYPE)
+        if len(intervals) and intervals["end"][-1] == self.frames - 1:
+            return
+        self._run_start = (start, float(timestamps[start]))
+        self._run_violations = int(self._read_column("violations")[start:].sum())
+
+    def _read_column(self, name):
+        dtype, shape = self.specs[name]
+        rows = np.fromfile(os.path.join(self.path, name + ".bin"), dtype=dtype, count=self.frames * int(np.prod(shape)))
+        return rows.reshape((-1,) + shape)
+
+    def append(self, timestamp, landmarks=None, box=None, verdict=CENTERED, violation=False):
+        dtype, shape = self.specs["landmarks"]
+        self.buffers["timestamps"].append(timestamp)
+        self.buffers["landmarks"].append(np.zeros(shape, dtype) if landmarks is None else landmarks)
+        self.buffers["has_face"].append(landmarks is not None)
+        self.buffers["boxes"].append((0, 0, 0, 0) if box is None else box)
+        self.buffers["verdicts"].append(verdict)
+        self.buffers["violations"].append(violation)
+        self._track_interval(self.frames, timestamp, verdict != CENTERED, violation)
+        self.frames += 1
+        if len(self.buffers["timestamps"]) >= FLUSH_EVERY:
+            self.flush()
+
+    # Looking-away runs that produced at least one violation are indexed.
+    def _track_interval(self, index, timestamp, away, violation):
+        if away:
+            if self._run_start is None:
+                self._run_start = (index, timestamp)
+            self._run_violations += violation
+        else:
+            self._close_interval(index - 1, self._last_time)
+        self._last_time = timestamp
+
+    def _close_interval(self, end, end_time):
+        if self._run_start is not None and self._run_violations:
+            record = np.array([(self._run_start[0], end, self._run_start[1], end_time,
+                                min(self._run_violations, 0xFFFF))], dtype=INTERVAL_DTYPE)
+            self.intervals.write(record.tobytes())
+        self._run_start = None
+        self._run_violations = 0
+
+    def flush(self):
+        for name, rows in self.buffers.items():
+            if rows:
+                dtype, shape = self.specs[name]
+                self.files[name].write(np.asarray(rows, dtype=dtype).reshape((-1,) + shape).tobytes())
+                rows.clear()
+            self.files[name].flush()
+        self.intervals.flush()
+
+    def close(self):
+        self._close_interval(self.frames - 1, self._last_time)
+        self.flush()
+        for f in self.files.values():
+            f.close()
+        self.intervals.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _stride(dtype, shape):
+    return np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+
+
+def _committed_rows(path, specs):
+    rows = []
+    for name, (dtype, shape) in specs.items():
+        file_path = os.path.join(path, name + ".bin")
+        rows.append(os.path.getsize(file_path) // _stride(dtype, shape) if os.path.exists(file_path) else 0)
+    return min(rows)
+
+
+# Whole interval records whose rows survived the column truncation.
+def _committed_intervals(file_path, frames):
+    count = os.path.getsize(file_path) // INTERVAL_DTYPE.itemsize
+    records = np.fromfile(file_path, dtype=INTERVAL_DTYPE, count=count)
+    return int(np.searchsorted(records["end"], frames))
+
+
+# ----------------------- Reader -----------------------
+
+class SessionReader:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.specs = {k: (v[0], tuple(v[1])) for k, v in json.load(f)["columns"].items()}
+        # Columns may be mid-append; only rows present in every column are exposed.
+        self.frames = _committed_rows(path, self.specs)
+        for name, (dtype, shape) in self.specs.items():
+            setattr(self, name, self._map(name + ".bin", dtype, (self.frames,) + shape))
+        count = os.path.getsize(os.path.join(path, "intervals.bin")) // INTERVAL_DTYPE.itemsize
+        self.intervals = self._map("intervals.bin", INTERVAL_DTYPE, (count,))
+
+    def _map(self, name, dtype, shape):
+        if shape[0] == 0:
+            return np.zeros(shape, dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self):
+        return self.frames
+
+    @property
+    def nose_x(self):
+        return self.landmarks[:, NOSE_TIP, 0]
+
+    def landmark(self, index, axis=0):
+        return self.landmarks[:, index, "xyz".index(axis) if isinstance(axis, str) else axis]
+
+    def where(self, mask):
+        return np.flatnonzero(np.asarray(mask) & self.has_face.astype(bool))
+
+    def time_slice(self, start, end):
+        lo, hi = np.searchsorted(self.timestamps, [start, end])
+        return slice(int(lo), int(hi))
+
+    def violation_times(self):
+        return self.timestamps[np.flatnonzero(self.violations)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a landmark session archive.")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    reader = SessionReader(args.path)
+    nose_x = reader.nose_x
+    low, high = NOSE_BOUNDS
+    print(f"Frames: {len(reader)}")
+    if len(reader):
+        print(f"Duration: {reader.timestamps[-1] - reader.timestamps[0]:.1f}s")
+    print(f"Frames with nose_x < {low}: {len(reader.where(nose_x < low))}")
+    print(f"Frames with nose_x > {high}: {len(reader.where(nose_x > high))}")
+    print(f"Violations: {int(reader.violations.sum())} in {len(reader.intervals)} intervals")
+    for iv in reader.intervals:
+        print(f"  {iv['start_time']:8.2f}s - {iv['end_time']:8.2f}s  frames {iv['start']}-{iv['end']}"
+              f"  ({iv['violations']} violations)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import math
-from Crypto.Cipher import DES, AES
+from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
 import binascii
+from cipher_cache import default_cache
 
 
 # ----------------------- Substitution Ciphers -----------------------
@@ -148,7 +149,7 @@ IP_TABLE = [58, 50, 42, 34, 26, 18, 10, 2, 60, 52, 44, 36, 28, 20, 12, 4,
 
 E_TABLE = [32, 1, 2, 3, 4, 5, 4, 5, 6, 7, 8, 9, 8, 9, 10, 11, 12, 13,
            12, 13, 14, 15, 16, 17, 16, 17, 18, 19, 20, 21, 20, 21, 22, 23,
-           24, 25, 26, 27, 28, 29, 28, 29, 30, 31, 32, 1]
+           24, 25, 24, 25, 26, 27, 28, 29, 28, 29, 30, 31, 32, 1]
 
 
 def permute(block, table):
@@ -168,7 +169,7 @@ def des_one_round_demo(plaintext_hex, key_hex):
     R1 = bin(int(L0, 2) ^ int(sbox_out, 2))[2:].zfill(32)
     print(f"L1={R0}, R1={R1}")
 
-    cipher = DES.new(binascii.unhexlify(key_hex), DES.MODE_ECB)
+    cipher = default_cache.ecb(binascii.unhexlify(key_hex), "DES")
     enc = cipher.encrypt(binascii.unhexlify(plaintext_hex))
     dec = cipher.decrypt(enc)
     print(f"Encrypted: {binascii.hexlify(enc).decode()}")
@@ -193,7 +194,7 @@ def aes_encryption_demo(pt_bytes, key_bytes):
         for c in range(4):
             s[r][c] ^= k[r][c]
     print_state("After AddRoundKey", s)
-    cipher = AES.new(key_bytes, AES.MODE_ECB)
+    cipher = default_cache.ecb(key_bytes)
     enc = cipher.encrypt(pad(pt_bytes, AES.block_size))
     dec = unpad(cipher.decrypt(enc), AES.block_size)
     print(f"\nAES Encrypted: {enc.hex()}")
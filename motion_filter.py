@@ -0,0 +1,67 @@
+import cv2
+
+# SETTINGS
+THUMB_SIZE = (32, 24)       # frames are compared at this resolution
+DIFF_THRESHOLD = 4.0        # mean absolute grey-level change (0-255) that counts as motion
+HIST_THRESHOLD = 0.05       # Bhattacharyya distance between grey histograms
+MAX_SKIP = 15               # frames that may reuse one result
+MAX_STALENESS = 1.0         # seconds a reused result may be old
+
+
+# ----------------------- Change Pre-filter -----------------------
+
+class ChangeFilter:
+    # Frames are compared against the last *inferred* frame, not the previous
+    # one, so slow drift still adds up to a change eventually.
+    def __init__(self, method="diff", threshold=None, max_skip=MAX_SKIP, max_staleness=MAX_STALENESS,
+                 thumb_size=THUMB_SIZE):
+        if method not in ("diff", "hist"):
+            raise ValueError(f"Unknown change method: {method}")
+        self.method = method
+        self.threshold = threshold if threshold is not None else (DIFF_THRESHOLD if method == "diff" else HIST_THRESHOLD)
+        self.max_skip = max_skip
+        self.max_staleness = max_staleness
+        self.thumb_size = thumb_size
+        self.reference = None
+        self.last_inference = None
+        self.skipped = 0
+        self.result = None
+        self.stats = {"frames": 0, "inferences": 0, "avoided": 0}
+
+    def _signature(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        thumb = cv2.resize(gray, self.thumb_size, interpolation=cv2.INTER_AREA)
+        if self.method == "hist":
+            hist = cv2.calcHist([thumb], [0], None, [32], [0, 256])
+            return cv2.normalize(hist, hist)
+        return thumb
+
+    def _delta(self, signature):
+        if self.method == "hist":
+            return cv2.compareHist(self.reference, signature, cv2.HISTCMP_BHATTACHARYYA)
+        return cv2.absdiff(self.reference, signature).mean()
+
+    def should_infer(self, frame, now):
+        self.stats["frames"] += 1
+        signature = self._signature(frame)
+        stale = (self.reference is None or self.skipped >= self.max_skip
+                 or now - self.last_inference >= self.max_staleness)
+        if not stale and self._delta(signature) <= self.threshold:
+            self.skipped += 1
+            self.stats["avoided"] += 1
+            return False
+        self.reference = signature
+        self.last_inference = now
+        self.skipped = 0
+        self.stats["inferences"] += 1
+        return True
+
+    # Runs infer(frame) when the scene changed, otherwise returns the previous result.
+    def run(self, frame, now, infer):
+        if self.should_infer(frame, now):
+            self.result = infer(frame)
+        return self.result
+
+    def report(self):
+        frames = self.stats["frames"]
+        return dict(self.stats, skip_rate=self.stats["avoided"] / frames if frames else 0.0)
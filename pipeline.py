@@ -0,0 +1,600 @@
+import argparse
+import collections
+import datetime
+import importlib
+import queue
+import threading
+import time
+import cv2
+from adaptive_scheduler import timed_detect
+from proctor_logic import NOSE_BOUNDS, IRIS_BOUNDS, GraceTimer, landmarks_to_array, nose_looking_away, gaze_centered
+
+# SETTINGS
+QUEUE_SIZE = 2          # frames buffered between threads in threaded mode
+MODES = ("fused", "threaded")
+
+
+# ----------------------- Per-frame and Per-session State -----------------------
+
+class FrameState:
+    def __init__(self, index, now, image):
+        self.index = index
+        self.now = now
+        self.image = image
+        self.check_due = True       # stages without a CheckClock treat every frame as a check
+        self.faces = None
+        self.landmarks = None
+        self.is_away = False
+        self.status = None          # set by a decider when it made a decision on this frame
+        self.violation = False
+
+
+class Session:
+    def __init__(self, start_time=None, headless=False):
+        self.start_time = time.time() if start_time is None else start_time
+        self.headless = headless    # stages skip console output in headless runs
+        self.end_time = None
+        self.frames = 0
+        self.fps = 0.0
+        self.prev_tick = None
+        self.status = "OK"
+        self.violations = []        # (seconds since start, status)
+        self.events = []            # (datetime, status) for each counted violation
+        self.timeline = []          # (color, seconds) per check
+        self.counts = collections.Counter()
+        self.checks = 0
+
+    # FPS is processing speed, so it uses the wall clock even for file sources.
+    def tick(self):
+        self.frames += 1
+        tick = time.perf_counter()
+        if self.prev_tick is not None and tick > self.prev_tick:
+            self.fps = self.fps * 0.9 + (1.0 / (tick - self.prev_tick)) * 0.1   # smoothed FPS
+        self.prev_tick = tick
+
+    @property
+    def total_time(self):
+        return (self.end_time or time.time()) - self.start_time
+
+    def focus_retention(self):
+        green_time = sum(d for color, d in self.timeline if color == "green")
+        return green_time / self.total_time * 100 if self.total_time > 0 else 0.0
+
+    def check_retention(self):
+        return (self.checks - sum(self.counts.values())) / self.checks * 100 if self.checks else 0.0
+
+    def values(self, now):
+        return {
+            "status": self.status,
+            "violations": len(self.violations),
+            "elapsed": now - self.start_time,
+            "fps": self.fps,
+            "violation_rate": len(self.violations) / max(self.frames, 1) * 100,
+            "clock": datetime.datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+
+# ----------------------- Stage Base -----------------------
+
+class Stage:
+    side_effects = False        # stages that write files are left out of headless runs
+
+    def open(self, session):
+        pass
+
+    def process(self, state, session):
+        pass
+
+    def close(self, session):
+        pass
+
+    def summary(self):
+        return []
+
+
+# ----------------------- Source -----------------------
+
+# Cameras are timed by the wall clock. Files are timed by their own frame
+# timestamps (offset to the open time), so grace periods and check intervals
+# mean the same thing however fast the file is processed; `realtime` paces
+# files at their native speed.
+class CaptureSource:
+    def __init__(self, source=0, width=None, height=None, api=None, realtime=False):
+        self.source = int(source) if str(source).isdigit() else source
+        self.width = width
+        self.height = height
+        self.api = api
+        self.realtime = realtime
+        self.live = isinstance(self.source, int)
+        self.cap = None
+        self.start_time = None
+        self.timestamp = None       # time of the last frame read
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.source, self.api) if self.live and self.api is not None else cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open source {self.source}")
+        if self.live and self.width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.start_time = self.timestamp = time.time()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self.timestamp = time.time() if self.live else self.start_time + self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        if self.realtime and not self.live:
+            delay = self.timestamp - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        return frame
+
+    def clock(self):
+        return time.time() if self.live else self.timestamp
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+# ----------------------- Preprocess -----------------------
+
+class Flip(Stage):
+    def process(self, state, session):
+        state.image = cv2.flip(state.image, 1)
+
+
+class Resize(Stage):
+    def __init__(self, width, height):
+        self.size = (width, height)
+
+    def process(self, state, session):
+        state.image = cv2.resize(state.image, self.size)
+
+
+# Sets state.check_due every `interval` seconds (read2.py-read4.py cadence).
+class CheckClock(Stage):
+    def __init__(self, interval, immediate=False):
+        self.interval = interval
+        self.immediate = immediate
+        self.last_check = None
+
+    def open(self, session):
+        self.last_check = 0 if self.immediate else session.start_time
+
+    def process(self, state, session):
+        state.check_due = state.now - self.last_check >= self.interval
+        if state.check_due:
+            self.last_check = state.now
+
+
+# ----------------------- Detectors -----------------------
+
+# Face boxes from any face_detectors backend, optionally on the scheduler's
+# adaptive cadence and behind a ChangeFilter. Check frames always detect.
+class FaceDetect(Stage):
+    def __init__(self, detector, scheduler=None, change_filter=None):
+        self.detector = detector
+        self.scheduler = scheduler
+        self.change_filter = change_filter
+        self.faces = []
+
+    def process(self, state, session):
+        if self.scheduler:
+            detected = timed_detect(self.scheduler, state.now, self.detector, state.image,
+                                    force=state.check_due, change_filter=self.change_filter)
+        elif self.change_filter:
+            detected = self.change_filter.run(state.image, state.now, self.detector)
+        else:
+            detected = self.detector(state.image)
+        if detected is not None:
+            self.faces = detected
+        state.faces = self.faces
+
+    def summary(self):
+        lines = []
+        if self.scheduler:
+            sched = self.scheduler.report()
+            lines.append(f"Detections run: {sched['detections']} of {sched['frames']} frames ({sched['skipped_pct']:.1f}% skipped)")
+        if self.change_filter:
+            lines.append(f"Detector skipped on static frames: {self.change_filter.report()['avoided']}")
+        return lines
+
+
+# FaceMesh landmarks as an (N, 3) array. `when(state)` limits it to some
+# frames, e.g. read4.py only runs it on check frames with exactly one face.
+class FaceMesh(Stage):
+    def __init__(self, change_filter=None, when=None):
+        self.change_filter = change_filter
+        self.when = when
+        self.face_mesh = None
+
+    def open(self, session):
+        import mediapipe as mp
+        self.face_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True)
+
+    def _infer(self, image):
+        results = self.face_mesh.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        return landmarks_to_array(results.multi_face_landmarks[0].landmark) if results.multi_face_landmarks else None
+
+    def process(self, state, session):
+        if self.when and not self.when(state):
+            return
+        if self.change_filter:
+            state.landmarks = self.change_filter.run(state.image, state.now, self._infer)
+        else:
+            state.landmarks = self._infer(state.image)
+
+    def close(self, session):
+        if self.face_mesh is not None:
+            self.face_mesh.close()
+
+    def summary(self):
+        if not self.change_filter:
+            return []
+        skips = self.change_filter.report()
+        return [f"FaceMesh skipped on {skips['avoided']} of {skips['frames']} frames ({skips['skip_rate'] * 100:.1f}%)"]
+
+
+# ----------------------- Deciders -----------------------
+
+# Head pose from the nose tip (read.py / read5.py), every frame.
+class NoseDecider(Stage):
+    def __init__(self, bounds=NOSE_BOUNDS):
+        self.bounds = bounds
+
+    def process(self, state, session):
+        if state.landmarks is None:
+            state.is_away, state.status = True, "No Face Detected"
+        elif nose_looking_away(state.landmarks, self.bounds):
+            state.is_away, state.status = True, "Looking Away"
+        else:
+            state.is_away, state.status = False, "Centered"
+
+
+# Face count on check frames (read2.py / read3.py), plus iris gaze when
+# `gaze` is set and FaceMesh ran on the single face (read4.py).
+class FaceCountDecider(Stage):
+    def __init__(self, gaze=False, bounds=IRIS_BOUNDS):
+        self.gaze = gaze
+        self.bounds = bounds
+
+    def process(self, state, session):
+        if not state.check_due:
+            return
+        count = len(state.faces)
+        if count == 0:
+            state.status = "No Face Detected"
+        elif count > 1:
+            state.status = "Multiple Faces Detected"
+        elif self.gaze and state.landmarks is None:
+            state.status = "No Face Detected"
+        elif self.gaze and not gaze_centered(state.landmarks, self.bounds):
+            state.status = "Eye Gaze Away"
+        else:
+            state.status = "Centered"
+        state.is_away = state.status != "Centered"
+
+
+# ----------------------- Violation Policies -----------------------
+
+class GracePolicy(Stage):
+    def __init__(self, grace_period):
+        self.timer = GraceTimer(grace_period)
+
+    def process(self, state, session):
+        if state.status is None:
+            return
+        session.status = state.status
+        if self.timer.update(state.is_away, state.now):
+            state.violation = True
+            session.violations.append((state.now - session.start_time, state.status))
+            session.events.append((datetime.datetime.fromtimestamp(state.now), state.status))
+            session.counts[state.status] += 1
+
+
+# Every away check is red on the timeline; `changes_only` counts a violation
+# only when the status differs from the previous check (read2.py). `echo`
+# prints each check's status, or its label when given a status -> label dict;
+# `describe(state)` replaces the status as the logged event text.
+class CheckPolicy(Stage):
+    def __init__(self, interval, changes_only=False, echo=False, describe=None):
+        self.interval = interval
+        self.changes_only = changes_only
+        self.echo = echo
+        self.describe = describe
+        self.last_status = "Centered"
+
+    def process(self, state, session):
+        if not state.check_due or state.status is None:
+            return
+        session.checks += 1
+        session.status = state.status
+        session.timeline.append(("red" if state.is_away else "green", self.interval))
+        if self.echo and not session.headless:
+            print(self.echo.get(state.status, state.status) if isinstance(self.echo, dict) else state.status)
+        if state.is_away and not (self.changes_only and state.status == self.last_status):
+            state.violation = True
+            session.violations.append((state.now - session.start_time, state.status))
+            event = self.describe(state) if self.describe else state.status
+            session.events.append((datetime.datetime.fromtimestamp(state.now), event))
+            session.counts[state.status] += 1
+        self.last_status = state.status
+
+
+# ----------------------- Overlay and Sinks -----------------------
+
+# --- Helper: draw rectangles around eyes from a landmark array ---
+def draw_eye_boxes(frame, lm, color=(0, 255, 0)):
+    h, w = frame.shape[:2]
+    for inner, outer, top, bottom in ((33, 133, [33, 159, 145], [133, 23, 27]),
+                                      (362, 263, [362, 386, 374], [263, 253, 249])):
+        x_min, x_max = int(lm[inner, 0] * w), int(lm[outer, 0] * w)
+        y_min, y_max = int(lm[top, 1].min() * h), int(lm[bottom, 1].max() * h)
+        cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), color, 2)
+
+
+# --- Helper: face box (x, y, w, h) in pixels around a landmark array ---
+def landmark_box(lm, shape):
+    h, w = shape[:2]
+    x0, y0 = int(lm[:, 0].min() * w), int(lm[:, 1].min() * h)
+    x1, y1 = int(lm[:, 0].max() * w), int(lm[:, 1].max() * h)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+# `text` entries are (template, origin, scale, color); templates are
+# formatted with Session.values().
+class Overlay(Stage):
+    def __init__(self, text=(), eye_boxes=False, face_boxes=None):
+        self.text = text
+        self.eye_boxes = eye_boxes
+        self.face_boxes = face_boxes
+
+    def process(self, state, session):
+        if self.eye_boxes and state.landmarks is not None:
+            draw_eye_boxes(state.image, state.landmarks)
+        if self.face_boxes and state.faces:
+            for face in state.faces:
+                cv2.rectangle(state.image, (face.x, face.y), (face.x + face.w, face.y + face.h), self.face_boxes, 2)
+        values = session.values(state.now)
+        for template, origin, scale, color in self.text:
+            cv2.putText(state.image, template.format(**values), origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color, 2)
+
+
+class ArchiveSink(Stage):
+    side_effects = True
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.status = "OK"
+
+    def open(self, session):
+        from landmark_archive import SessionWriter
+        self.writer = SessionWriter(self.path)
+
+    # The verdict follows the frame being written, not session.status: in
+    # threaded mode the stages already run a few frames ahead of the sinks.
+    def process(self, state, session):
+        from landmark_archive import VERDICTS, LOOKING_AWAY
+        self.status = state.status or self.status
+        box = None if state.landmarks is None else landmark_box(state.landmarks, state.image.shape)
+        self.writer.append(state.now - session.start_time, state.landmarks, box=box,
+                           verdict=VERDICTS.get(self.status, LOOKING_AWAY), violation=state.violation)
+
+    def close(self, session):
+        self.writer.close()
+
+
+class EvidenceSink(Stage):
+    side_effects = True
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.recorder = None
+
+    def open(self, session):
+        from evidence_recorder import EvidenceRecorder
+        self.recorder = EvidenceRecorder(self.output_dir)
+
+    def process(self, state, session):
+        if state.violation:
+            self.recorder.trigger(state.status, state.now)
+        self.recorder.push(state.image, state.now)
+
+    def close(self, session):
+        self.recorder.close()
+
+    def summary(self):
+        return [f"Evidence clips saved: {self.recorder.stats['clips']} (dropped: {self.recorder.stats['dropped']}) → {self.output_dir}"]
+
+
+class Display:
+    def __init__(self, window):
+        self.window = window
+
+    # Returns False once the user pressed 'q'.
+    def show(self, image):
+        cv2.imshow(self.window, image)
+        return cv2.waitKey(1) & 0xFF != ord('q')
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+# ----------------------- Engine -----------------------
+
+class Pipeline:
+    # stages turn a frame into a decision (and draw on it); sinks consume the
+    # result. In threaded mode capture, stages and sinks/display each run on
+    # their own thread, connected by small bounded queues.
+    def __init__(self, source, stages, sinks=(), display=None, reports=(), mode="fused", queue_size=QUEUE_SIZE):
+        if mode not in MODES:
+            raise ValueError(f"Unknown pipeline mode: {mode}")
+        self.source = source
+        self.stages = list(stages)
+        self.sinks = list(sinks)
+        self.display = display
+        self.reports = list(reports)
+        self.mode = mode
+        self.queue_size = queue_size
+        self.timings = {}
+        self.elapsed = 0.0
+
+    def _run_stages(self, stages, state, session):
+        for stage in stages:
+            t0 = time.perf_counter()
+            stage.process(state, session)
+            timing = self.timings.setdefault(type(stage).__name__, [0.0, 0])
+            timing[0] += time.perf_counter() - t0
+            timing[1] += 1
+
+    def _deliver(self, state, session, sinks, display):
+        self._run_stages(sinks, state, session)
+        return display.show(state.image) if display else True
+
+    def _capture(self, index):
+        frame = self.source.read()
+        return None if frame is None else FrameState(index, self.source.timestamp, frame)
+
+    def _run_fused(self, session, sinks, display, max_frames, stop_event):
+        index = 0
+        while not stop_event.is_set() and (max_frames is None or index < max_frames):
+            state = self._capture(index)
+            if state is None:
+                break
+            session.tick()
+            self._run_stages(self.stages, state, session)
+            if not self._deliver(state, session, sinks, display):
+                break
+            index += 1
+
+    def _run_threaded(self, session, sinks, display, max_frames, stop_event):
+        captured, processed = queue.Queue(self.queue_size), queue.Queue(self.queue_size)
+        stop = threading.Event()
+        errors = []
+
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def capture():
+            try:
+                index = 0
+                while not (stop.is_set() or stop_event.is_set()) and (max_frames is None or index < max_frames):
+                    state = self._capture(index)
+                    if state is None:
+                        break
+                    put(captured, state)
+                    index += 1
+            except Exception as e:
+                errors.append(e)
+            put(captured, None)
+
+        def process():
+            try:
+                while not stop.is_set():
+                    try:
+                        state = captured.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if state is None:
+                        break
+                    session.tick()
+                    self._run_stages(self.stages, state, session)
+                    put(processed, state)
+            except Exception as e:
+                errors.append(e)
+            put(processed, None)
+
+        workers = [threading.Thread(target=capture, daemon=True), threading.Thread(target=process, daemon=True)]
+        for worker in workers:
+            worker.start()
+        try:
+            while True:
+                state = processed.get()
+                if state is None or not self._deliver(state, session, sinks, display):
+                    break
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+        if errors:
+            raise errors[0]
+
+    # headless drops the display, reports, console echo and file-writing sinks
+    # (benchmarks, session_service.py); setting stop_event from another thread
+    # ends the run.
+    def run(self, headless=False, max_frames=None, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        sinks = [s for s in self.sinks if not (headless and s.side_effects)]
+        display = None if headless else self.display
+        self.timings = {}
+        self.source.open()
+        session = Session(self.source.start_time, headless)
+        started = time.perf_counter()
+        for stage in self.stages + sinks:
+            stage.open(session)
+        try:
+            if self.mode == "threaded":
+                self._run_threaded(session, sinks, display, max_frames, stop_event)
+            else:
+                self._run_fused(session, sinks, display, max_frames, stop_event)
+        finally:
+            session.end_time = self.source.clock()
+            self.elapsed = time.perf_counter() - started
+            self.source.close()
+            for stage in self.stages + sinks:
+                stage.close(session)
+            if display:
+                display.close()
+        if not headless:
+            for stage in self.stages + sinks:
+                for line in stage.summary():
+                    print(f"[INFO] {line}")
+            for report in self.reports:
+                report.write(session)
+        return session
+
+    def report(self, session):
+        return {
+            "frames": session.frames,
+            "fps": session.frames / self.elapsed if self.elapsed > 0 else 0.0,
+            "stages_ms": {name: t / n * 1000 for name, (t, n) in self.timings.items() if n},
+        }
+
+
+# ----------------------- Benchmark -----------------------
+
+# Each read*.py exposes build_pipeline(source, mode); run them headless on the same clip.
+def benchmark(configs, clip, modes=MODES, max_frames=None):
+    results = []
+    for name in configs:
+        build = importlib.import_module(name).build_pipeline
+        for mode in modes:
+            pipeline = build(source=clip, mode=mode)
+            session = pipeline.run(headless=True, max_frames=max_frames)
+            results.append((name, mode, pipeline.report(session)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark read*.py pipeline configurations on a clip.")
+    parser.add_argument("clip")
+    parser.add_argument("--configs", nargs="+", default=["read", "read2", "read3", "read4", "read5"])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--max-frames", type=int, default=None)
+    args = parser.parse_args()
+
+    for name, mode, r in benchmark(args.configs, args.clip, args.modes, args.max_frames):
+        stages = ", ".join(f"{stage} {ms:.2f}" for stage, ms in sorted(r["stages_ms"].items(), key=lambda kv: -kv[1]))
+        print(f"{name:8s} {mode:9s} {r['frames']:6d} frames {r['fps']:8.1f} FPS | ms/frame: {stages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import numpy as np
+
+# SETTINGS (same defaults as read.py / read4.py / read5.py)
+GRACE_PERIOD = 2              # seconds before marking violation
+NOSE_BOUNDS = (0.3, 0.7)      # nose x outside this range = looking away
+IRIS_BOUNDS = (0.35, 0.65)    # iris position inside the eye = looking at screen
+
+NOSE_TIP = 1
+LEFT_IRIS = [474, 475, 476, 477]
+RIGHT_IRIS = [469, 470, 471, 472]
+LEFT_EYE = [33, 133]
+RIGHT_EYE = [362, 263]
+
+
+# --- Helper: MediaPipe landmark list -> (N, 3) float32 array ---
+def landmarks_to_array(landmarks):
+    return np.array([(p.x, p.y, p.z) for p in landmarks], dtype=np.float32)
+
+
+# All checks below take arrays shaped (..., landmarks, 3), so a single frame
+# and a whole recording are scored with the same code.
+def nose_looking_away(lm, bounds=NOSE_BOUNDS):
+    nose_x = lm[..., NOSE_TIP, 0]
+    return (nose_x < bounds[0]) | (nose_x > bounds[1])
+
+
+def gaze_ratios(lm):
+    # Gather only the 12 points used, so memory-mapped inputs read just those.
+    x = lm[..., 0][..., LEFT_IRIS + RIGHT_IRIS + LEFT_EYE + RIGHT_EYE].astype(np.float32)
+    left_iris_x = x[..., 0:4].mean(axis=-1)
+    right_iris_x = x[..., 4:8].mean(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        left_ratio = (left_iris_x - x[..., 8]) / (x[..., 9] - x[..., 8])
+        right_ratio = (right_iris_x - x[..., 10]) / (x[..., 11] - x[..., 10])
+    return left_ratio, right_ratio
+
+
+# Iris-position gaze check used by read4.py, vectorized.
+def gaze_centered(lm, bounds=IRIS_BOUNDS):
+    left_ratio, right_ratio = gaze_ratios(lm)
+    lo, hi = bounds
+    return (lo < left_ratio) & (left_ratio < hi) & (lo < right_ratio) & (right_ratio < hi)
+
+
+# --- Live grace-period state machine (read.py / read5.py) ---
+class GraceTimer:
+    def __init__(self, grace_period=GRACE_PERIOD):
+        self.grace_period = grace_period
+        self.looking_away_start = None
+
+    # Returns True on the frame where a violation is recorded.
+    def update(self, is_looking_away, now):
+        if not is_looking_away:
+            self.looking_away_start = None
+            return False
+        if self.looking_away_start is None:
+            self.looking_away_start = now
+        elif now - self.looking_away_start > self.grace_period:
+            self.looking_away_start = None
+            return True
+        return False
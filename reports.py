@@ -0,0 +1,150 @@
+import datetime
+import os
+import matplotlib.pyplot as plt
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+
+# Status -> report label
+COUNT_LABELS = {
+    "No Face Detected": "Times Looked Away (Face Missing)",
+    "Multiple Faces Detected": "Times Multiple People Detected",
+    "Eye Gaze Away": "Times Looked Away (Eye Gaze)",
+    "Looking Away": "Times Looked Away (Head Turned)",
+}
+CHECK_STATUSES = ("No Face Detected", "Multiple Faces Detected")
+
+
+# ----------------------- Plots -----------------------
+
+def violation_scatter(violations, path):
+    plt.figure(figsize=(6, 1))
+    plt.scatter([v[0] for v in violations], [1] * len(violations), c='red')
+    plt.yticks([])
+    plt.xlabel("Time (s)")
+    plt.title("Violation Timeline")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def timeline_bar(timeline, total_time, path):
+    fig, ax = plt.subplots(figsize=(10, 1))
+    start_pos = 0
+    for color, duration in timeline:
+        ax.barh(0, duration, left=start_pos, color=color, edgecolor='none')
+        start_pos += duration
+    ax.set_xlim(0, total_time)
+    ax.set_yticks([])
+    ax.set_xlabel("Time (seconds)")
+    plt.savefig(path, bbox_inches='tight')
+    plt.close()
+
+
+# ----------------------- PDF -----------------------
+
+# One layout for every script: title, summary table, violation timestamps
+# and an optional timeline image.
+def generate_pdf_report(report_path, title, summary_rows, timestamps=(), image=None, image_size=(400, 100)):
+    doc = SimpleDocTemplate(report_path, pagesize=A4)
+    styles = getSampleStyleSheet()
+    elements = [Paragraph(f"<b>{title}</b>", styles['Title']), Spacer(1, 20)]
+
+    summary_table = Table([["Metric", "Value"]] + [[k, v] for k, v in summary_rows], hAlign='LEFT')
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('ALIGN', (1, 1), (-1, -1), 'RIGHT')
+    ]))
+    elements.append(summary_table)
+    elements.append(Spacer(1, 20))
+
+    if timestamps:
+        elements.append(Paragraph("Violation Timestamps", styles['Heading2']))
+        for ts in timestamps:
+            elements.append(Paragraph(ts, styles['Normal']))
+        elements.append(Spacer(1, 12))
+
+    if image and os.path.exists(image):
+        elements.append(Paragraph("Violation Timeline", styles['Heading2']))
+        elements.append(RLImage(image, width=image_size[0], height=image_size[1]))
+    elif not timestamps:
+        elements.append(Paragraph("No violations were detected.", styles['Normal']))
+
+    doc.build(elements)
+    if image and os.path.exists(image):
+        os.remove(image)
+    print(f"[INFO] PDF report generated → {report_path}")
+
+
+def _count_rows(session, statuses, labels=COUNT_LABELS):
+    return [(labels[status], session.counts[status]) for status in statuses]
+
+
+# --- Grace-period sessions (read.py / read5.py) ---
+class ViolationReport:
+    def __init__(self, path, statuses=("Looking Away", "No Face Detected")):
+        self.path = path
+        self.statuses = statuses
+
+    def write(self, session):
+        rows = [
+            ("Total Time (s)", f"{session.total_time:.2f}"),
+            ("Total Frames", session.frames),
+            ("Average FPS", f"{session.frames / max(session.total_time, 1e-9):.2f}"),
+            ("Total Violations", len(session.violations)),
+            ("Violation Rate (%)", f"{len(session.violations) / max(session.frames, 1) * 100:.2f}%"),
+        ] + _count_rows(session, self.statuses)
+        image = None
+        if session.violations:
+            image = "timeline_plot.png"
+            violation_scatter(session.violations, image)
+        generate_pdf_report(self.path, "Eye Tracking Violation Report", rows, image=image)
+
+
+# --- Periodic-check sessions (read3.py / read4.py) ---
+class ProctoringReport:
+    def __init__(self, path, statuses=CHECK_STATUSES):
+        self.path = path
+        self.statuses = statuses
+
+    def write(self, session):
+        rows = [
+            ("Start Time", datetime.datetime.fromtimestamp(session.start_time).strftime("%Y-%m-%d %H:%M:%S")),
+            ("End Time", datetime.datetime.fromtimestamp(session.end_time).strftime("%Y-%m-%d %H:%M:%S")),
+            ("Total Duration (min)", f"{session.total_time / 60:.2f}"),
+            ("Total Checks", session.checks),
+        ] + _count_rows(session, self.statuses) + [("Focus Retention", f"{session.focus_retention():.2f}%")]
+        timestamps = [f"{t.strftime('%H:%M:%S')} - {status}" for t, status in session.events]
+        image = "timeline.png"
+        timeline_bar(session.timeline, session.total_time, image)
+        generate_pdf_report(self.path, "Proctoring Session Report", rows, timestamps, image, image_size=(500, 50))
+
+
+# --- End-of-test summary on stdout (read2.py-read4.py); `log` also prints every event ---
+# Focus retention is the green share of the timeline, or with `per_check` the
+# share of checks that were not counted as violations (read2.py's metric).
+class ConsoleReport:
+    def __init__(self, statuses=CHECK_STATUSES, log=False, labels=COUNT_LABELS, per_check=False):
+        self.statuses = statuses
+        self.log = log
+        self.labels = labels
+        self.per_check = per_check
+
+    def write(self, session):
+        if self.log:
+            print("\n--- Detection Log ---")
+            print(f"{datetime.datetime.fromtimestamp(session.start_time).strftime('%Y-%m-%d %H:%M:%S')} - Recording started")
+            for t, status in session.events:
+                print(f"{t.strftime('%Y-%m-%d %H:%M:%S')} - {status}")
+            print(f"{datetime.datetime.fromtimestamp(session.end_time).strftime('%Y-%m-%d %H:%M:%S')} - Recording ended")
+
+        print("\n--- Test Metrics ---")
+        print(f"Total test duration: {session.total_time / 60:.2f} minutes")
+        print(f"Total checks: {session.checks}")
+        for label, count in _count_rows(session, self.statuses, self.labels):
+            print(f"{label}: {count}")
+        retention = session.check_retention() if self.per_check else session.focus_retention()
+        print(f"Focus retention: {retention:.2f}%")
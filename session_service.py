@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import importlib
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pipeline import Stage, Overlay
+
+# SETTINGS
+HOST = "127.0.0.1"
+PORT = 8765
+PUSH_INTERVAL = 0.5      # seconds between WebSocket status pushes
+CONFIG = "read"          # read*.py module whose build_pipeline() each session runs
+CONFIGS = ("read", "read2", "read3", "read4", "read5")
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+# ----------------------- Session -----------------------
+
+# Final sink of a hosted pipeline: hands the pipeline's session to the
+# service session and bumps its version for the WebSocket pushes.
+class StatusSink(Stage):
+    def __init__(self, target):
+        self.target = target
+
+    def open(self, session):
+        # clock first: snapshot() reads it as soon as run_session is set
+        self.target.clock = session.start_time
+        self.target.run_session = session
+        self.target.state = "running"
+
+    def process(self, state, session):
+        self.target.clock = state.now
+        self.target.version += 1
+
+
+class Session:
+    # run() builds the read*.py pipeline and runs it headless on a worker
+    # thread; the event loop only reads its state through snapshot().
+    def __init__(self, source, session_id=None, realtime=False, config=CONFIG):
+        if config not in CONFIGS:
+            raise ValueError(f"Unknown config: {config}")
+        self.id = session_id or uuid.uuid4().hex[:8]
+        self.source = source
+        self.realtime = realtime
+        self.config = config
+        self.stop_event = threading.Event()
+        self.state = "starting"
+        self.error = None
+        self.run_session = None     # pipeline.Session, set once the source is open
+        self.change_filters = []
+        self.clock = None           # source time of the latest frame, so elapsed stops with the session
+        self.version = 0
+
+    def run(self):
+        try:
+            pipeline = importlib.import_module(self.config).build_pipeline(source=self.source)
+            pipeline.source.realtime = self.realtime
+            pipeline.stages = [stage for stage in pipeline.stages if not isinstance(stage, Overlay)]
+            pipeline.sinks.append(StatusSink(self))
+            self.change_filters = [stage.change_filter for stage in pipeline.stages
+                                   if getattr(stage, "change_filter", None)]
+            pipeline.run(headless=True, stop_event=self.stop_event)
+            self.state = "stopped" if self.stop_event.is_set() else "finished"
+        except Exception as e:
+            self.state = "error"
+            self.error = str(e)
+        self.version += 1
+
+    def snapshot(self, timeline=False):
+        run = self.run_session
+        status = {
+            "id": self.id,
+            "source": str(self.source),
+            "config": self.config,
+            "state": self.state,
+            "status": run.status if run else "OK",
+            "frames": run.frames if run else 0,
+            "fps": round(run.fps, 2) if run else 0.0,
+            "violations": len(run.violations) if run else 0,
+            "elapsed": round(self.clock - run.start_time, 2) if run else 0.0,
+            "frames_skipped": sum(f.stats["avoided"] for f in self.change_filters),
+        }
+        if self.error:
+            status["error"] = self.error
+        if timeline:
+            status["timeline"] = [(round(t, 3), s) for t, s in list(run.violations)] if run else []
+        return status
+
+
+# ----------------------- Service -----------------------
+
+class SessionService:
+    def __init__(self):
+        self.sessions = {}
+        self.tasks = {}
+
+    def start_session(self, source, session_id=None, realtime=False, config=CONFIG):
+        session = Session(source, session_id, realtime, config)
+        if session.id in self.sessions:
+            raise ValueError(f"Session {session.id} already exists.")
+        self.sessions[session.id] = session
+        # A dedicated thread per session: the shared default pool would make
+        # sessions beyond its size wait for a running one to finish.
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"session-{session.id}")
+        self.tasks[session.id] = asyncio.get_running_loop().run_in_executor(executor, session.run)
+        executor.shutdown(wait=False)
+        return session
+
+    async def stop_all(self):
+        for session in self.sessions.values():
+            session.stop_event.set()
+        if self.tasks:
+            await asyncio.gather(*self.tasks.values())
+
+    # --- HTTP ---
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, target, _ = request_line.split(" ", 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+            path, _, query = target.partition("?")
+
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self.websocket(reader, writer, headers, dict(p.split("=", 1) for p in query.split("&") if "=" in p))
+                return
+            status, payload = self.route(method, path, body)
+            await send_json(writer, status, payload)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            await send_json(writer, 400, {"error": str(e)})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method, path, body):
+        parts = [p for p in path.split("/") if p]
+        if parts == ["sessions"] and method == "GET":
+            return 200, [s.snapshot() for s in self.sessions.values()]
+        if parts == ["sessions"] and method == "POST":
+            spec = json.loads(body or b"{}")
+            if not isinstance(spec, dict):
+                raise ValueError("Body must be a JSON object.")
+            if "source" not in spec:
+                raise ValueError("Missing 'source'.")
+            session = self.start_session(spec["source"], spec.get("id"), spec.get("realtime", False),
+                                         spec.get("config", CONFIG))
+            return 201, session.snapshot()
+        if len(parts) == 2 and parts[0] == "sessions" and method == "GET":
+            session = self.sessions.get(parts[1])
+            return (200, session.snapshot(timeline=True)) if session else (404, {"error": "Unknown session"})
+        if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "stop" and method == "POST":
+            session = self.sessions.get(parts[1])
+            if not session:
+                return 404, {"error": "Unknown session"}
+            session.stop_event.set()
+            return 200, session.snapshot()
+        return 404, {"error": "Not found"}
+
+    # --- WebSocket: push status whenever a session changed ---
+    async def websocket(self, reader, writer, headers, params):
+        if "sec-websocket-key" not in headers:
+            raise ValueError("Missing Sec-WebSocket-Key.")
+        accept = base64.b64encode(hashlib.sha1((headers["sec-websocket-key"] + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        await writer.drain()
+        wanted = params.get("session")
+        seen = {}
+        client = asyncio.ensure_future(answer_client_frames(reader, writer))
+        try:
+            while not client.done():
+                sessions = [s for s in self.sessions.values() if wanted in (None, s.id)]
+                changed = [s.snapshot() for s in sessions if seen.get(s.id) != s.version]
+                seen.update({s.id: s.version for s in sessions})
+                if changed:
+                    writer.write(ws_frame(json.dumps(changed).encode()))
+                    await writer.drain()
+                await asyncio.wait([client], timeout=PUSH_INTERVAL)
+        finally:
+            client.cancel()
+
+
+async def send_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    reason = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found"}.get(status, "")
+    writer.write((f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body)
+    await writer.drain()
+
+
+# --- Helper: read one WebSocket frame, unmasking client frames ---
+async def read_ws_frame(reader):
+    head = await reader.readexactly(2)
+    length = head[1] & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), "big")
+    mask = await reader.readexactly(4) if head[1] & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return head[0] & 0x0F, payload
+
+
+# Answers pings and returns once the client closes (or drops) the connection.
+async def answer_client_frames(reader, writer):
+    try:
+        while True:
+            opcode, payload = await read_ws_frame(reader)
+            if opcode == 0x8:
+                writer.write(ws_frame(payload[:2], 0x8))
+                await writer.drain()
+                return
+            if opcode == 0x9:
+                writer.write(ws_frame(payload, 0xA))
+                await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+
+def ws_frame(payload, opcode=0x1):
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 1 << 16:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+    return header + payload
+
+
+# ----------------------- Local Client -----------------------
+
+async def http_request(method, path, payload=None, host=HOST, port=PORT):
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(data)
+
+
+async def watch(host=HOST, port=PORT, session=None, messages=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(uuid.uuid4().bytes).decode()
+    path = f"/ws?session={session}" if session else "/ws"
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    received = 0
+    try:
+        while messages is None or received < messages:
+            opcode, payload = await read_ws_frame(reader)
+            if opcode == 0x8:
+                break
+            if opcode == 0x1:
+                print(json.loads(payload))
+                received += 1
+    finally:
+        writer.close()
+
+
+async def serve(host, port, sources, realtime, config=CONFIG):
+    service = SessionService()
+    server = await asyncio.start_server(service.handle, host, port)
+    for source in sources:
+        service.start_session(source, realtime=realtime, config=config)
+    print(f"[INFO] Session service listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host proctoring sessions with a local HTTP/WebSocket status API.")
+    parser.add_argument("sources", nargs="*", help="video files or camera indices to start with")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--realtime", action="store_true", help="pace recorded videos at their native FPS")
+    parser.add_argument("--config", default=CONFIG, choices=CONFIGS, help="read*.py pipeline each session runs")
+    parser.add_argument("--watch", action="store_true", help="act as a client and print WebSocket updates")
+    args = parser.parse_args()
+
+    try:
+        if args.watch:
+            asyncio.run(watch(args.host, args.port))
+        else:
+            asyncio.run(serve(args.host, args.port, args.sources, args.realtime, args.config))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
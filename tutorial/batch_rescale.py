@@ -0,0 +1,113 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import cv2 as cv
+import numpy as np
+from rescale import rescale
+
+# SETTINGS
+SCALE = 0.75
+WORKERS = os.cpu_count() or 4
+MAX_IN_FLIGHT = 4 * WORKERS     # bounds how many decoded images exist at once
+EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+# --- Helper: yield (source, destination) pairs for every image under root ---
+def find_images(src_root, dst_root, ext=None):
+    for dirpath, _, filenames in os.walk(src_root):
+        rel = os.path.relpath(dirpath, src_root)
+        for name in sorted(filenames):
+            stem, suffix = os.path.splitext(name)
+            if suffix.lower() not in EXTENSIONS:
+                continue
+            out_name = stem + (("." + ext.lstrip(".")) if ext else suffix)
+            yield os.path.join(dirpath, name), os.path.normpath(os.path.join(dst_root, rel, out_name))
+
+
+def is_up_to_date(src, dst):
+    try:
+        return os.path.getmtime(dst) >= os.path.getmtime(src)
+    except OSError:
+        return False
+
+
+# --- Worker: decode, rescale, encode and write one image ---
+# cv.imdecode/resize/imencode release the GIL, so a thread pool scales across cores.
+def process_image(src, dst, scale, max_side):
+    data = np.fromfile(src, dtype=np.uint8)
+    img = cv.imdecode(data, cv.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"Could not decode {src}")
+    if max_side:
+        scale = min(1.0, max_side / max(img.shape[:2]))
+    if scale != 1.0:
+        img = rescale(img, scale)
+    ok, encoded = cv.imencode(os.path.splitext(dst)[1], img)
+    if not ok:
+        raise ValueError(f"Could not encode {dst}")
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp_path = dst + ".tmp"
+    encoded.tofile(tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def batch_rescale(src_root, dst_root, scale=SCALE, max_side=None, ext=None,
+                  workers=WORKERS, max_in_flight=MAX_IN_FLIGHT, force=False):
+    # Writing into src would overwrite the originals or feed outputs back into the walk.
+    src_real, dst_real = os.path.realpath(src_root), os.path.realpath(dst_root)
+    if os.path.commonpath([src_real, dst_real]) == src_real:
+        raise ValueError(f"Destination {dst_root} must not be {src_root} or inside it.")
+    stats = {"processed": 0, "skipped": 0, "failed": 0, "elapsed": 0.0, "images_per_sec": 0.0}
+    start = time.time()
+    pending = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for src, dst in find_images(src_root, dst_root, ext):
+            if not force and is_up_to_date(src, dst):
+                stats["skipped"] += 1
+                continue
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done, stats)
+            pending.add(pool.submit(process_image, src, dst, scale, max_side))
+        _collect(pending, stats)
+
+    stats["elapsed"] = time.time() - start
+    stats["images_per_sec"] = stats["processed"] / max(stats["elapsed"], 1e-9)
+    return stats
+
+
+def _collect(futures, stats):
+    for future in futures:
+        try:
+            future.result()
+            stats["processed"] += 1
+        except (OSError, ValueError, cv.error) as e:
+            stats["failed"] += 1
+            print(f"[WARN] {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescale every image under a directory.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--scale", type=float, default=SCALE)
+    parser.add_argument("--max-side", type=int, help="fit the longest side to this many pixels instead of --scale")
+    parser.add_argument("--ext", help="output extension, e.g. .jpg (defaults to the input's)")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument("--force", action="store_true", help="rewrite outputs that are already up to date")
+    args = parser.parse_args()
+
+    try:
+        stats = batch_rescale(args.src, args.dst, args.scale, args.max_side, args.ext,
+                              args.workers, args.max_in_flight, args.force)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Processed: {stats['processed']}  Skipped: {stats['skipped']}  Failed: {stats['failed']}")
+    print(f"Time: {stats['elapsed']:.2f}s  ({stats['images_per_sec']:.1f} images/s)")
+
+
+if __name__ == "__main__":
+    main()
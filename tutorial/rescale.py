@@ -10,9 +10,10 @@ def rescale(frame,scale=0.75):
 
 
 
-img=cv.imread("Photos/test.png")
-cv.imshow('Cat',img)
-imgResized=rescale(img)
-cv.imshow("Cat-2",imgResized)
+if __name__ == "__main__":
+    img=cv.imread("Photos/test.png")
+    cv.imshow('Cat',img)
+    imgResized=rescale(img)
+    cv.imshow("Cat-2",imgResized)
 
-cv.waitKey(0)
\ No newline at end of file
+    cv.waitKey(0)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import argparse
+import numpy as np
+from proctor_logic import GRACE_PERIOD, GraceTimer
+from landmark_archive import SessionReader, CENTERED
+
+
+# ----------------------- Run-length Helpers -----------------------
+
+# Start/end (inclusive) indices of every run of True values.
+def runs(mask):
+    padded = np.concatenate(([False], np.asarray(mask, dtype=bool), [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[0::2], edges[1::2] - 1
+
+
+# For timers started at frames i with grace periods g (paired arrays), the
+# first frame j > i with t[j] - t[i] > g, i.e. the frame that fires.
+# searchsorted gives the answer up to float rounding of t[i] + g; the two
+# correction passes make the comparison exactly the one GraceTimer does.
+def next_fire(t, i, g):
+    n = len(t)
+    j = np.maximum(np.searchsorted(t, t[i] + g, side="right"), i + 1)
+    while True:
+        too_early = (j < n) & ~(t[np.minimum(j, n - 1)] - t[i] > g)
+        if not too_early.any():
+            break
+        j += too_early
+    while True:
+        too_late = (j - 1 > i) & (t[j - 1] - t[i] > g)
+        if not too_late.any():
+            break
+        j -= too_late
+    return j
+
+
+# ----------------------- Scoring -----------------------
+
+def _validate(timestamps, looking_away):
+    t = np.asarray(timestamps, dtype=np.float64)
+    away = np.asarray(looking_away, dtype=bool)
+    if t.shape != away.shape or t.ndim != 1:
+        raise ValueError("timestamps and looking_away must be 1-D arrays of equal length.")
+    if np.any(np.diff(t) < 0):
+        raise ValueError("timestamps must be non-decreasing.")
+    return t, away
+
+
+# Violation frame indices for every grace period at once; returns one array per period.
+def violation_frames(timestamps, looking_away, grace_periods):
+    t, away = _validate(timestamps, looking_away)
+    grace_periods = np.atleast_1d(grace_periods)
+    if len(t) == 0:
+        return [np.empty(0, dtype=np.int64) for _ in grace_periods]
+    starts, ends = runs(away)
+    g_values = np.asarray(grace_periods, dtype=np.float64)
+
+    # Within a looking-away run the timer restarts on the frame after each
+    # violation, so events form a chain start -> fire -> fire+1 -> fire ...
+    # Every (grace period, run) chain advances one step per iteration.
+    g_idx = np.repeat(np.arange(len(grace_periods)), len(starts))
+    cursor = np.tile(starts, len(grace_periods))
+    run_end = np.tile(ends, len(grace_periods))
+    fired_g, fired_j = [], []
+    while cursor.size:
+        j = next_fire(t, cursor, g_values[g_idx])
+        fire = j <= run_end
+        fired_g.append(g_idx[fire])
+        fired_j.append(j[fire])
+        cursor = j[fire] + 1
+        g_idx, run_end = g_idx[fire], run_end[fire]
+        keep = cursor <= run_end
+        cursor, g_idx, run_end = cursor[keep], g_idx[keep], run_end[keep]
+
+    fired_g = np.concatenate(fired_g) if fired_g else np.empty(0, dtype=np.int64)
+    fired_j = np.concatenate(fired_j) if fired_j else np.empty(0, dtype=np.int64)
+    order = np.lexsort((fired_j, fired_g))
+    fired_g, fired_j = fired_g[order], fired_j[order]
+    bounds = np.searchsorted(fired_g, np.arange(len(grace_periods) + 1))
+    return [fired_j[bounds[k]:bounds[k + 1]] for k in range(len(grace_periods))]
+
+
+def score(timestamps, looking_away, grace_period=GRACE_PERIOD, status=None):
+    t, away = _validate(timestamps, looking_away)
+    frames = violation_frames(t, away, [grace_period])[0]
+    starts, ends = runs(away)
+    # Each event's duration is measured from the frame its timer started on:
+    # the run start, or the frame after the previous violation in the same run.
+    run_of = np.searchsorted(starts, frames, side="right") - 1
+    timer_start = starts[run_of] if len(frames) else frames
+    if len(frames) > 1:
+        same_run = np.concatenate(([False], run_of[1:] == run_of[:-1]))
+        timer_start = np.where(same_run, np.concatenate(([0], frames[:-1] + 1)), timer_start)
+    total_time = float(t[-1] - t[0]) if len(t) else 0.0
+    return {
+        "violation_frames": frames,
+        "violation_times": t[frames],
+        "durations": t[frames] - t[timer_start],
+        "statuses": [status[i] for i in frames] if status is not None else None,
+        "violations": len(frames),
+        "away_time": float(np.sum(t[np.minimum(ends + 1, len(t) - 1)] - t[starts])) if len(t) else 0.0,
+        "violations_per_min": len(frames) / (total_time / 60) if total_time > 0 else 0.0,
+        "violation_rate_pct": len(frames) / max(len(t), 1) * 100,
+    }
+
+
+def score_many(timestamps, looking_away, grace_periods):
+    return np.array([len(f) for f in violation_frames(timestamps, looking_away, grace_periods)])
+
+
+# --- Reference: the per-frame loop of pipeline.GracePolicy (read.py/read5.py) ---
+def score_live(timestamps, looking_away, grace_period=GRACE_PERIOD):
+    timer = GraceTimer(grace_period)
+    return np.array([i for i, (now, away) in enumerate(zip(timestamps, looking_away))
+                     if timer.update(bool(away), float(now))], dtype=np.int64)
+
+
+# ----------------------- Sessions -----------------------
+
+def load_session(path):
+    reader = SessionReader(path)
+    return np.asarray(reader.timestamps), np.asarray(reader.verdicts) != CENTERED
+
+
+def score_sessions(paths, grace_periods):
+    table = np.zeros((len(paths), len(grace_periods)), dtype=np.int64)
+    for row, path in enumerate(paths):
+        t, away = load_session(path)
+        table[row] = score_many(t, away, grace_periods)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score archived sessions for several grace periods.")
+    parser.add_argument("sessions", nargs="+", help="landmark archive directories")
+    parser.add_argument("--grace", type=float, nargs="+", default=[1, 1.5, 2, 3, 5])
+    args = parser.parse_args()
+
+    table = score_sessions(args.sessions, args.grace)
+    print("Session".ljust(30) + "".join(f"{g:>8g}s" for g in args.grace))
+    for path, row in zip(args.sessions, table):
+        print(path[-30:].ljust(30) + "".join(f"{v:>9d}" for v in row))
+    print("Total".ljust(30) + "".join(f"{v:>9d}" for v in table.sum(axis=0)))
+
+
+if __name__ == "__main__":
+    main()